@@ -0,0 +1,171 @@
+import numpy as np
+
+from attendance_store import AttendanceStore
+
+# Session key = (day << _PLACE_BITS) | emplacement code; pair key = (member << _SESSION_BITS) | session.
+# Fixed widths keep keys stable while new emplacements, sessions and members appear.
+_PLACE_BITS = 20
+_SESSION_BITS = 32
+_SESSION_MASK = (1 << _SESSION_BITS) - 1
+
+
+class AttendanceIndex:
+    """
+    Per-member attendance lookups, built with vectorized passes over the
+    columnar AttendanceStore.
+
+    A session is a unique (emplacement, date). The index keeps, per session,
+    its emplacement code, date and the row of its latest record; the unique
+    (member, session) pairs; per-member session counts and last-seen dates;
+    and all session dates sorted. attendance_count, absence_count and
+    not_seen are then O(1) / O(log sessions) per member.
+
+    Rows appended to the store afterwards are folded in with extend(), at a
+    cost proportional to the new rows.
+    """
+
+    def __init__(self, store: AttendanceStore = None):
+        self.store = store if store is not None else AttendanceStore()
+        self.rows_indexed = 0
+        self.session_keys = np.empty(0, dtype=np.int64)
+        self.session_emplacements = np.empty(0, dtype=np.int32)
+        self.session_dates = np.empty(0, dtype="datetime64[D]")
+        self.session_latest_rows = np.empty(0, dtype=np.int64)
+        self.sorted_session_dates = np.empty(0, dtype="datetime64[D]")
+        self.pair_keys = np.empty(0, dtype=np.int64)
+        self.member_counts = np.empty(0, dtype=np.int64)
+        self.member_last_seen = np.empty(0, dtype="datetime64[D]")
+
+    @classmethod
+    def build(cls, store: AttendanceStore) -> "AttendanceIndex":
+        index = cls(store)
+        index.extend()
+        return index
+
+    def extend(self):
+        """
+        Fold the store rows added since the last build/extend into the index.
+        Returns the (member, session) pair keys added and the sessions whose
+        latest record changed, for structures derived from the index.
+        """
+        store = self.store
+        start, end = self.rows_indexed, len(store)
+        self._grow_members(len(store.member_ids))
+        if start >= end:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        ts = store.timestamps[start:end]
+        has_ts = ~np.isnat(ts)
+        days = ts.astype("datetime64[D]").astype(np.int64)
+        members = store.member_codes[start:end]
+        places = store.emplacement_codes[start:end]
+
+        # Sessions: unique (date, emplacement) over rows that have both
+        rows = np.flatnonzero(has_ts & (places >= 0))
+        fresh = updated = np.empty(0, dtype=np.int64)
+        # A delta of rows without a timestamp or emplacement adds no session or pair
+        if rows.size:
+            keys = (days[rows] << _PLACE_BITS) | places[rows]
+            session_of_row = self._session_ids(keys)
+
+            # Latest record per session: sort by (session, timestamp), keep the last of each group
+            order = np.lexsort((ts[rows], session_of_row))
+            grouped = session_of_row[order]
+            last_of_group = np.r_[grouped[1:] != grouped[:-1], True]
+            sessions = grouped[last_of_group]
+            candidates = start + rows[order[last_of_group]]
+            current = self.session_latest_rows[sessions]
+            newer = (current < 0) | (store.timestamps[candidates] > store.timestamps[np.maximum(current, 0)])
+            updated = sessions[newer]
+            self.session_latest_rows[updated] = candidates[newer]
+
+            # Unique (member, session) pairs not counted yet
+            row_members = members[rows]
+            with_member = row_members >= 0
+            pairs = np.unique((row_members[with_member].astype(np.int64) << _SESSION_BITS) | session_of_row[with_member])
+            # pair_keys stays sorted: binary search, then insert in place of a full set union
+            pos = np.searchsorted(self.pair_keys, pairs)
+            known = pos < len(self.pair_keys)
+            known[known] = self.pair_keys[pos[known]] == pairs[known]
+            fresh = pairs[~known]
+            if fresh.size:
+                self.pair_keys = np.insert(self.pair_keys, pos[~known], fresh)
+                np.add.at(self.member_counts, fresh >> _SESSION_BITS, 1)
+
+        # Last date seen per member, over every row of the member (NaT is the int64 minimum)
+        seen = has_ts & (members >= 0)
+        np.maximum.at(self.member_last_seen.view(np.int64), members[seen], days[seen])
+        self.rows_indexed = end
+        return fresh, updated
+
+    def _grow_members(self, n_members: int):
+        grow = n_members - len(self.member_counts)
+        if grow > 0:
+            self.member_counts = np.concatenate([self.member_counts, np.zeros(grow, dtype=np.int64)])
+            self.member_last_seen = np.concatenate(
+                [self.member_last_seen, np.full(grow, np.datetime64("NaT"), dtype="datetime64[D]")]
+            )
+
+    def _session_ids(self, keys: np.ndarray) -> np.ndarray:
+        """Session index per key, registering sessions seen for the first time."""
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        ids = np.empty(len(unique_keys), dtype=np.int64)
+        found = np.zeros(len(unique_keys), dtype=bool)
+        if len(self.session_keys):
+            sorter = np.argsort(self.session_keys)
+            pos = np.minimum(np.searchsorted(self.session_keys, unique_keys, sorter=sorter), len(sorter) - 1)
+            found = self.session_keys[sorter[pos]] == unique_keys
+            ids[found] = sorter[pos[found]]
+
+        new_keys = unique_keys[~found]
+        ids[~found] = len(self.session_keys) + np.arange(len(new_keys))
+        if len(new_keys):
+            self.session_keys = np.concatenate([self.session_keys, new_keys])
+            self.session_emplacements = np.concatenate(
+                [self.session_emplacements, (new_keys & ((1 << _PLACE_BITS) - 1)).astype(np.int32)]
+            )
+            self.session_dates = np.concatenate(
+                [self.session_dates, (new_keys >> _PLACE_BITS).astype("datetime64[D]")]
+            )
+            self.session_latest_rows = np.concatenate(
+                [self.session_latest_rows, np.full(len(new_keys), -1, dtype=np.int64)]
+            )
+            self.sorted_session_dates = np.sort(self.session_dates)
+        return ids[inverse.ravel()]
+
+    @staticmethod
+    def split_pairs(pair_keys: np.ndarray):
+        """(member codes, session indexes) of pair keys."""
+        return pair_keys >> _SESSION_BITS, pair_keys & _SESSION_MASK
+
+    @property
+    def pair_members(self) -> np.ndarray:
+        return self.pair_keys >> _SESSION_BITS
+
+    @property
+    def pair_sessions(self) -> np.ndarray:
+        return self.pair_keys & _SESSION_MASK
+
+    @property
+    def total_sessions(self) -> int:
+        return len(self.session_dates)
+
+    def _code(self, member_id) -> int:
+        # Members added to the store but not indexed yet count as unseen
+        code = self.store.member_code(member_id)
+        return code if 0 <= code < len(self.member_counts) else -1
+
+    def attendance_count(self, member_id) -> int:
+        code = self._code(member_id)
+        return int(self.member_counts[code]) if code >= 0 else 0
+
+    def absence_count(self, member_id) -> int:
+        return self.total_sessions - self.attendance_count(member_id)
+
+    def not_seen(self, member_id) -> int:
+        """Sessions held after the member's last attendance (all of them if never seen)."""
+        code = self._code(member_id)
+        if code < 0 or np.isnat(self.member_last_seen[code]):
+            return self.total_sessions
+        after = np.searchsorted(self.sorted_session_dates, self.member_last_seen[code], side="right")
+        return int(len(self.sorted_session_dates) - after)
@@ -0,0 +1,121 @@
+import asyncio
+import os
+from typing import List, Optional, Tuple
+
+from attendance_store import AttendanceStore
+
+ATTENDANCE_COLUMNS = "id, user:member_id(username), member_id, emplacement, timestamp"
+
+
+class AttendanceLoader:
+    """
+    Keyset-paginated reads of the attendance table.
+
+    Pages are `id > last_id ORDER BY id LIMIT page_size`, so every page is an
+    index range scan however deep into the table it starts, unlike offset
+    pagination. A full load splits [min id, max id] into partitions that
+    are paged concurrently, at most `fanout` requests in flight, and each
+    page is appended to the store as soon as it arrives.
+
+    attendance.id is expected to be an integer identity column. Ids are
+    handed out at insert time but become visible at commit, so a batch
+    insert can commit after a later id: fetch_after() is meant to be called
+    with the watermark less `overlap`, and the caller drops rows it already
+    has. The id type is checked on each full load (integer_ids); with
+    other ids (uuid) there is no range to partition or watermark to resume
+    from, so the table is paged in one sequence and the caller should fall
+    back to full loads.
+    """
+
+    def __init__(self, client, page_size: int = 1000, fanout: int = 4, partitions_per_worker: int = 4,
+                 overlap: int = 200):
+        if page_size < 1 or fanout < 1:
+            raise ValueError("page_size and fanout must be >= 1")
+        if overlap < 0:
+            raise ValueError("overlap must be >= 0")
+        self.client = client
+        self.page_size = page_size
+        self.fanout = fanout
+        self.partitions_per_worker = partitions_per_worker
+        self.overlap = overlap
+        # None until a full load has seen an id
+        self.integer_ids: Optional[bool] = None
+
+    @classmethod
+    def from_env(cls, client) -> "AttendanceLoader":
+        return cls(
+            client,
+            page_size=int(os.environ.get("ATTENDANCE_PAGE_SIZE", 1000)),
+            fanout=int(os.environ.get("ATTENDANCE_LOAD_FANOUT", 4)),
+            overlap=int(os.environ.get("ATTENDANCE_SYNC_OVERLAP", 200)),
+        )
+
+    def _fetch_page(self, after_id, upto_id=None) -> List[dict]:
+        query = self.client.table("attendance").select(ATTENDANCE_COLUMNS)
+        if after_id is not None:
+            query = query.gt("id", after_id)
+        if upto_id is not None:
+            query = query.lte("id", upto_id)
+        return query.order("id").limit(self.page_size).execute().data or []
+
+    def _fetch_bounds(self) -> Optional[Tuple]:
+        def edge(desc):
+            rows = self.client.table("attendance").select("id").order("id", desc=desc).limit(1).execute().data
+            return rows[0]["id"] if rows else None
+
+        lowest, highest = edge(False), edge(True)
+        if lowest is None or highest is None:
+            return None
+        return lowest, highest
+
+    async def fetch_after(self, after_id: Optional[int]) -> List[dict]:
+        """Every row with id above after_id, in id order (incremental sync, integer ids only)."""
+        rows = []
+        while True:
+            page = await asyncio.to_thread(self._fetch_page, after_id)
+            rows.extend(page)
+            if len(page) < self.page_size:
+                return rows
+            after_id = page[-1]["id"]
+
+    async def fetch_new(self, store: AttendanceStore) -> List[dict]:
+        """Rows not in store yet: above its watermark, re-reading `overlap` ids below it for late commits."""
+        rows = await self.fetch_after(store.last_id - self.overlap)
+        return store.unseen(rows)
+
+    async def load(self, store: AttendanceStore) -> int:
+        """Stream the whole table into store. Returns the number of rows loaded."""
+        bounds = await asyncio.to_thread(self._fetch_bounds)
+        if bounds is None:
+            return 0
+        lowest, highest = bounds
+        self.integer_ids = all(isinstance(i, int) and not isinstance(i, bool) for i in bounds)
+        if not self.integer_ids:
+            # No id arithmetic on uuids: one keyset sequence over the whole table
+            partitions = [(None, None)]
+        else:
+            # Ids are not dense, so use more partitions than workers to even out the load
+            count = self.fanout * self.partitions_per_worker
+            step = max(1, -(-(highest - lowest + 1) // count))
+            partitions = [(start - 1, min(start + step - 1, highest)) for start in range(lowest, highest + 1, step)]
+
+        slots = asyncio.Semaphore(self.fanout)
+        append_lock = asyncio.Lock()
+        loaded = 0
+
+        async def load_partition(after_id, upto_id):
+            nonlocal loaded
+            while True:
+                async with slots:
+                    page = await asyncio.to_thread(self._fetch_page, after_id, upto_id)
+                if page:
+                    # One append at a time; fetches of other partitions keep running meanwhile
+                    async with append_lock:
+                        await asyncio.to_thread(store.append, page)
+                    loaded += len(page)
+                if len(page) < self.page_size:
+                    return
+                after_id = page[-1]["id"]
+
+        await asyncio.gather(*(load_partition(after_id, upto_id) for after_id, upto_id in partitions))
+        return loaded
@@ -0,0 +1,115 @@
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def format_percent(values: np.ndarray) -> List[str]:
+    return [f"{value:.1f}%" for value in values.tolist()]
+
+
+class AttendancePivot:
+    """
+    Presence grid of the roster (Feo, Anarana) by session date.
+
+    `present` is a bool matrix (roster rows, dates) built in one scatter
+    from the attendance rows; per-row totals (Fahatongavana), the first
+    emplacement seen on each date and the per-Feo rapport percentages are
+    reductions over it. Dates are labels in chronological order.
+    """
+
+    def __init__(self, feo: np.ndarray, names: List[str], dates: List[str], present: np.ndarray, emplacements: List[str]):
+        self.feo = feo
+        self.names = names
+        self.dates = dates
+        self.present = present
+        self.emplacements = emplacements
+
+    @classmethod
+    def build(
+        cls,
+        roster_feo: Sequence,
+        roster_names: Sequence[str],
+        att_names: Sequence[str],
+        att_places: Sequence,
+        att_date_codes: np.ndarray,
+        dates: List[str],
+    ) -> "AttendancePivot":
+        """
+        roster_*: one entry per roster row, in roster order (duplicate
+        (Feo, Anarana) pairs are dropped). att_*: one entry per attendance
+        row, chronological, with att_date_codes indexing into `dates`.
+        """
+        roster = pd.DataFrame({"Feo": list(roster_feo), "Anarana": list(roster_names)}).drop_duplicates()
+        feo = roster["Feo"].to_numpy()
+        names = roster["Anarana"].tolist()
+
+        # Presence is per name, shared by every roster row with that name
+        name_codes, unique_names = pd.factorize(pd.Series(names, dtype=object))
+        att_codes = pd.Index(unique_names).get_indexer(pd.Series(list(att_names), dtype=object))
+        att_date_codes = np.asarray(att_date_codes, dtype=np.int64)
+        listed = att_codes >= 0
+
+        present_by_name = np.zeros((len(unique_names), len(dates)), dtype=bool)
+        present_by_name[att_codes[listed], att_date_codes[listed]] = True
+        # Rows with a blank Anarana (code -1) match no attendance: absent everywhere
+        named = np.flatnonzero(name_codes >= 0)
+        present = np.zeros((len(names), len(dates)), dtype=bool)
+        present[named] = present_by_name[name_codes[named]]
+
+        # Emplacement per date: first place among listed members, in roster order then chronologically
+        places = pd.Series(list(att_places), dtype=object)
+        first_row_of_name = np.full(len(unique_names), len(names), dtype=np.int64)
+        np.minimum.at(first_row_of_name, name_codes[named], named)
+        candidates = np.flatnonzero(listed & places.notna().to_numpy())
+        order = candidates[np.lexsort((candidates, first_row_of_name[att_codes[candidates]]))]
+        emplacements = [""] * len(dates)
+        seen_dates, first = np.unique(att_date_codes[order], return_index=True)
+        for date_code, row in zip(seen_dates.tolist(), order[first].tolist()):
+            emplacements[date_code] = places.iat[row]
+
+        return cls(feo, names, dates, present, emplacements)
+
+    @classmethod
+    def from_frames(cls, df_list: pd.DataFrame, df_attendance: pd.DataFrame) -> "AttendancePivot":
+        """
+        From the roster (Feo, Anarana) and the attendance export (Anarana,
+        Toerana, Daty, _parsed_date) read back from the report's Excel files.
+        """
+        df_attendance = df_attendance.sort_values(by="_parsed_date", kind="stable")
+        dates = df_attendance.drop_duplicates("Daty")["Daty"].tolist()
+        date_codes = pd.Index(dates).get_indexer(df_attendance["Daty"])
+        return cls.build(
+            df_list["Feo"], df_list["Anarana"],
+            df_attendance["Anarana"], df_attendance["Toerana"],
+            date_codes, dates,
+        )
+
+    @property
+    def totals(self) -> np.ndarray:
+        """Fahatongavana: sessions attended per roster row."""
+        return self.present.sum(axis=1)
+
+    @property
+    def total_column(self) -> str:
+        return f"Fahatongavana({len(self.dates)})"
+
+    def rows_for(self, feo_value) -> np.ndarray:
+        return np.flatnonzero(self.feo == feo_value)
+
+    def rapport(self, rows: np.ndarray) -> List[str]:
+        """Share of the given roster rows present on each date, as "12.5%"."""
+        if len(rows) == 0:
+            return format_percent(np.zeros(len(self.dates)))
+        return format_percent(self.present[rows].mean(axis=0) * 100)
+
+    def to_frame(self, rows: np.ndarray = None) -> pd.DataFrame:
+        """Feo, Anarana, one P/A column per date, then Fahatongavana(N)."""
+        if rows is None:
+            rows = np.arange(len(self.names))
+        grid = np.where(self.present[rows], "P", "A")
+        frame = pd.DataFrame(grid, columns=self.dates)
+        frame.insert(0, "Anarana", [self.names[row] for row in rows.tolist()])
+        frame.insert(0, "Feo", self.feo[rows])
+        frame[self.total_column] = self.totals[rows]
+        return frame
@@ -0,0 +1,205 @@
+from datetime import datetime, timezone
+
+import numpy as np
+from dateutil.parser import parse
+
+
+def parse_timestamp(ts: str) -> datetime:
+    """ISO timestamps from Supabase; fromisoformat is the fast path, dateutil the fallback."""
+    try:
+        return datetime.fromisoformat(ts)
+    except ValueError:
+        return parse(ts)
+
+
+def parse_timestamps(values) -> np.ndarray:
+    """
+    ISO strings to datetime64[us] in UTC, in one vectorized numpy parse.
+    UTC strings ("+00:00" / "Z", what Supabase returns) are parsed by numpy
+    directly; any other offset goes through parse_timestamp.
+    """
+    stripped = []
+    slow = []
+    for i, ts in enumerate(values):
+        if not ts:
+            stripped.append("NaT")
+        elif ts.endswith("+00:00"):
+            stripped.append(ts[:-6])
+        elif ts.endswith("Z"):
+            stripped.append(ts[:-1])
+        else:
+            stripped.append("NaT")
+            slow.append(i)
+
+    out = np.array(stripped, dtype="datetime64[us]")
+    for i in slow:
+        dt = parse_timestamp(values[i])
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+        out[i] = np.datetime64(dt, "us")
+    return out
+
+
+def to_datetime(value: np.datetime64) -> datetime:
+    """datetime64 (UTC) back to an aware datetime, for Babel formatting."""
+    return value.astype("datetime64[us]").item().replace(tzinfo=timezone.utc)
+
+
+class AttendanceStore:
+    """
+    Columnar copy of the attendance table, parsed once at ingestion.
+
+    One entry per row in parallel columns: attendance ids (int64, -1 when
+    missing or not an integer), UTC timestamps (datetime64[us]), interned
+    member and emplacement codes (int32, -1 when missing) and the raw
+    timestamp strings. Member ids, usernames and emplacement names are
+    looked up by code. last_id is the highest integer attendance id
+    ingested, the watermark for incremental syncs.
+    """
+
+    def __init__(self):
+        self.member_ids = []
+        self.usernames = []
+        self.emplacements = []
+        self._member_codes = {}
+        self._emplacement_codes = {}
+        # Column buffers grow by doubling; the public columns are views of the used rows
+        self._id_buf = np.empty(0, dtype=np.int64)
+        self._ts_buf = np.empty(0, dtype="datetime64[us]")
+        self._member_buf = np.empty(0, dtype=np.int32)
+        self._place_buf = np.empty(0, dtype=np.int32)
+        self.raw_timestamps = []
+        self.last_id = 0
+        self._size = 0
+
+    @classmethod
+    def from_rows(cls, rows) -> "AttendanceStore":
+        store = cls()
+        store.append(rows)
+        return store
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._id_buf[: len(self)]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._ts_buf[: len(self)]
+
+    @property
+    def member_codes(self) -> np.ndarray:
+        return self._member_buf[: len(self)]
+
+    @property
+    def emplacement_codes(self) -> np.ndarray:
+        return self._place_buf[: len(self)]
+
+    def _reserve(self, needed: int):
+        capacity = len(self._ts_buf)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 1024)
+        used = len(self)
+        for attr in ("_id_buf", "_ts_buf", "_member_buf", "_place_buf"):
+            old = getattr(self, attr)
+            grown = np.empty(capacity, dtype=old.dtype)
+            grown[:used] = old[:used]
+            setattr(self, attr, grown)
+
+    def _member_code(self, member_id, username):
+        if not member_id:
+            return -1
+        code = self._member_codes.get(member_id)
+        if code is None:
+            code = len(self.member_ids)
+            self._member_codes[member_id] = code
+            self.member_ids.append(member_id)
+            self.usernames.append(username)
+        elif username and not self.usernames[code]:
+            self.usernames[code] = username
+        return code
+
+    def _emplacement_code(self, emplacement):
+        if not emplacement:
+            return -1
+        code = self._emplacement_codes.get(emplacement)
+        if code is None:
+            code = len(self.emplacements)
+            self._emplacement_codes[emplacement] = code
+            self.emplacements.append(emplacement)
+        return code
+
+    def append(self, rows):
+        """Ingest raw Supabase rows (id, user:member_id(username), member_id, emplacement, timestamp)."""
+        if not rows:
+            return
+        members = np.fromiter(
+            (self._member_code(row.get("member_id"), (row.get("user") or {}).get("username")) for row in rows),
+            dtype=np.int32, count=len(rows),
+        )
+        places = np.fromiter(
+            (self._emplacement_code(row.get("emplacement")) for row in rows),
+            dtype=np.int32, count=len(rows),
+        )
+        ids = [row.get("id") for row in rows]
+        ids = [i if isinstance(i, int) and not isinstance(i, bool) else -1 for i in ids]
+        raw = [row.get("timestamp") for row in rows]
+
+        start = len(self)
+        end = start + len(rows)
+        self._reserve(end)
+        self._id_buf[start:end] = ids
+        self._ts_buf[start:end] = parse_timestamps(raw)
+        self._member_buf[start:end] = members
+        self._place_buf[start:end] = places
+        self.raw_timestamps.extend(raw)
+        self.last_id = max([self.last_id] + ids)
+        # Last, so the column views never cover rows still being written
+        self._size = end
+
+    def snapshot(self) -> "AttendanceStore":
+        """
+        Copy of the rows ingested so far, compact enough to hand to another
+        process: columns trimmed to their length, no raw timestamp strings.
+        """
+        snap = AttendanceStore()
+        snap.member_ids = list(self.member_ids)
+        snap.usernames = list(self.usernames)
+        snap.emplacements = list(self.emplacements)
+        snap._member_codes = dict(self._member_codes)
+        snap._emplacement_codes = dict(self._emplacement_codes)
+        size = len(self)
+        snap._id_buf = self._id_buf[:size].copy()
+        snap._ts_buf = self._ts_buf[:size].copy()
+        snap._member_buf = self._member_buf[:size].copy()
+        snap._place_buf = self._place_buf[:size].copy()
+        snap.last_id = self.last_id
+        snap._size = size
+        return snap
+
+    def unseen(self, rows) -> list:
+        """The rows whose integer id is not in the store yet (rows without one are kept)."""
+        ids = [row.get("id") for row in rows]
+        ints = [i for i in ids if isinstance(i, int) and not isinstance(i, bool)]
+        if not ints:
+            return list(rows)
+        stored = self.ids
+        known = set(stored[stored >= min(ints)].tolist())
+        return [row for row, i in zip(rows, ids) if i not in known]
+
+    def member_code(self, member_id) -> int:
+        return self._member_codes.get(member_id, -1)
+
+    def emplacement_code(self, emplacement) -> int:
+        return self._emplacement_codes.get(emplacement, -1)
+
+    def username(self, code: int) -> str:
+        if code < 0:
+            return "N/A"
+        return self.usernames[code] or "N/A"
+
+    def emplacement(self, code: int) -> str:
+        return self.emplacements[code] if code >= 0 else "N/A"
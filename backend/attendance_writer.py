@@ -0,0 +1,198 @@
+import asyncio
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import List, Tuple
+
+
+class AttendanceWriter:
+    """
+    Write-behind queue for `attendance` inserts.
+
+    enqueue() appends the rows to a local JSONL journal (one fsync per call)
+    and returns; a background task inserts pending rows in bulk once
+    `max_batch` rows are waiting or `flush_interval` seconds have passed.
+    Failed inserts are retried with exponential backoff, and rows stay in
+    the journal until an insert succeeds, so on restart start() re-queues
+    whatever a crash left unflushed. Rows carry their own timestamp, taken
+    at enqueue time, so a delayed flush does not shift attendance times.
+
+    Delivery is at-least-once: if the database commits a batch but the
+    response is lost, the retry inserts it again.
+
+    Journal lines:
+      {"op": "row", "seq": 12, "row": {...}}
+      {"op": "ack", "seq": 12}          every row up to seq is in the database
+    """
+
+    def __init__(self, client, journal_path: str, max_batch: int = 50, flush_interval: float = 1.0,
+                 backoff_base: float = 0.5, backoff_max: float = 30.0):
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        self.client = client
+        self.journal_path = journal_path
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._pending: List[tuple] = []  # (seq, row)
+        self._seq = 0
+        self._journaling = 0  # enqueue() calls writing to the journal right now
+        self._journal_lock = threading.Lock()
+        self._wakeup = None
+        self._task = None
+        self._stopping = False
+        self.flushed = 0
+        self.batches = 0
+        self.failures = 0
+        self.recovered = 0
+
+    @classmethod
+    def from_env(cls, client) -> "AttendanceWriter":
+        return cls(
+            client,
+            journal_path=os.environ.get("ATTENDANCE_JOURNAL", "attendance_journal.jsonl"),
+            max_batch=int(os.environ.get("ATTENDANCE_FLUSH_BATCH", 50)),
+            flush_interval=float(os.environ.get("ATTENDANCE_FLUSH_INTERVAL", 1.0)),
+        )
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    # ----- journal -----
+
+    def _append_journal(self, ops: List[dict]):
+        with self._journal_lock:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                for op in ops:
+                    f.write(json.dumps(op, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _replay_journal(self) -> Tuple[List[tuple], int]:
+        """Rows not acknowledged yet, in seq order, and the highest seq in the journal."""
+        rows = {}
+        acked = 0
+        if not os.path.exists(self.journal_path):
+            return [], 0
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    op = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn last line after a crash: that enqueue never returned
+                    continue
+                if op.get("op") == "row":
+                    rows[op["seq"]] = op["row"]
+                elif op.get("op") == "ack":
+                    acked = max(acked, op["seq"])
+        last_seq = max([acked] + list(rows))
+        return [(seq, row) for seq, row in sorted(rows.items()) if seq > acked], last_seq
+
+    async def _acknowledge(self, seq: int):
+        if not self._pending and not self._journaling:
+            # Nothing pending or being journaled: start a fresh journal instead of growing it
+            # forever. Done on the event loop so no enqueue() can start in between.
+            with self._journal_lock:
+                tmp = self.journal_path + ".tmp"
+                open(tmp, "w").close()
+                os.replace(tmp, self.journal_path)
+        else:
+            await asyncio.to_thread(self._append_journal, [{"op": "ack", "seq": seq}])
+
+    # ----- queue -----
+
+    async def enqueue(self, rows: List[dict]):
+        """Journal rows and queue them for the next bulk insert."""
+        if not rows:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        ops = []
+        for row in rows:
+            self._seq += 1
+            ops.append({"op": "row", "seq": self._seq, "row": {"timestamp": now, **row}})
+        self._journaling += 1
+        try:
+            await asyncio.to_thread(self._append_journal, ops)
+        finally:
+            self._journaling -= 1
+        self._pending.extend((op["seq"], op["row"]) for op in ops)
+        if len(self._pending) >= self.max_batch and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def flush(self) -> bool:
+        """Insert everything pending, batch by batch. False when an insert fails."""
+        while self._pending:
+            batch = self._pending[: self.max_batch]
+            try:
+                await asyncio.to_thread(
+                    lambda: self.client.table("attendance").insert([row for _, row in batch]).execute()
+                )
+            except Exception as e:
+                self.failures += 1
+                print(f"⚠️ Attendance flush failed ({len(batch)} rows pending retry): {e}")
+                return False
+            del self._pending[: len(batch)]
+            self.flushed += len(batch)
+            self.batches += 1
+            await self._acknowledge(batch[-1][0])
+        return True
+
+    async def _run(self):
+        attempt = 0
+        while not self._stopping:
+            if attempt:
+                delay = min(self.backoff_base * 2 ** (attempt - 1), self.backoff_max)
+            else:
+                delay = self.flush_interval
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stopping:
+                break
+            attempt = 0 if await self.flush() else attempt + 1
+
+    async def start(self) -> List[dict]:
+        """
+        Re-queue rows a previous run left in the journal and start the flush
+        task. Returns the recovered rows: they are not in the database yet,
+        so the caller can count them as already marked.
+        """
+        recovered, last_seq = await asyncio.to_thread(self._replay_journal)
+        # New seqs must stay above every ack already in the journal
+        self._seq = max(self._seq, last_seq)
+        if recovered:
+            self._pending = recovered + self._pending
+            self.recovered += len(recovered)
+            print(f"Recovered {len(recovered)} unflushed attendance rows from the journal")
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        return [row for _, row in recovered]
+
+    async def stop(self):
+        """
+        Stop the flush task and try one last flush; unflushed rows stay
+        journaled. The task is not cancelled: an insert already running in
+        a worker thread would carry on and the final flush would send its
+        batch again. It is woken up instead and exits once any flush in
+        progress has finished.
+        """
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "flushed": self.flushed,
+            "batches": self.batches,
+            "failures": self.failures,
+            "recovered": self.recovered,
+        }
@@ -0,0 +1,102 @@
+import asyncio
+import os
+from collections import Counter
+from typing import Any, Callable, List, Sequence, Tuple
+
+from inference import InferenceExecutor
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching in front of a batched model call.
+
+    Items submitted within `max_wait_ms` of each other are grouped, up to
+    `max_batch` per call, and `batch_fn(items)` runs once for the group on
+    the inference executor. `batch_fn` must return one result per item, in
+    order. Each caller gets back only its own result.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], Sequence[Any]],
+        executor: InferenceExecutor,
+        max_batch: int = 16,
+        max_wait_ms: float = 5.0,
+    ):
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        self.batch_fn = batch_fn
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer = None
+        self._tasks = set()
+        self.batch_sizes = Counter()
+
+    @classmethod
+    def from_env(cls, batch_fn, executor: InferenceExecutor) -> "MicroBatcher":
+        return cls(
+            batch_fn,
+            executor,
+            max_batch=int(os.environ.get("RECOGNITION_MAX_BATCH", 16)),
+            max_wait_ms=float(os.environ.get("RECOGNITION_MAX_WAIT_MS", 5)),
+        )
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    async def submit_many(self, items: Sequence[Any]) -> list:
+        return list(await asyncio.gather(*(self.submit(item) for item in items)))
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch = self._pending[: self.max_batch]
+        self._pending = self._pending[self.max_batch:]
+        if self._pending:
+            # Leftovers start a new window (or flush now if already full)
+            if len(self._pending) >= self.max_batch:
+                asyncio.get_running_loop().call_soon(self._flush)
+            else:
+                self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        items = [item for item, _ in batch]
+        self.batch_sizes[len(items)] += 1
+        try:
+            results = await self.executor.run(self.batch_fn, items)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        batches = sum(self.batch_sizes.values())
+        items = sum(size * count for size, count in self.batch_sizes.items())
+        return {
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "batches": batches,
+            "items": items,
+            "mean_batch_size": round(items / batches, 2) if batches else 0.0,
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+        }
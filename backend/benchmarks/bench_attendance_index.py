@@ -0,0 +1,182 @@
+"""
+Benchmark: member statistics from AttendanceStore + AttendanceIndex vs the
+per-member scans get_all_members used before.
+
+Synthetic data: 500 members, 5 years of sessions (2 per week), ~70%
+attendance. The legacy code is O(members x records), so it runs on
+--legacy-members members and is extrapolated to the full roster.
+
+Before timing, the index is also built by extend() in deltas, including
+deltas whose rows have no timestamp or no emplacement, and checked against
+a single build.
+
+Usage (from backend/):
+    python benchmarks/bench_attendance_index.py
+    python benchmarks/bench_attendance_index.py --members 500 --years 5 --legacy-members 25
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from dateutil.parser import parse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from attendance_store import AttendanceStore
+from attendance_index import AttendanceIndex
+
+EMPLACEMENTS = ["Ambohijatovo", "Analakely", "Isotry", "Andravoahangy"]
+
+
+def make_records(members, years, per_week, rate, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 5, 6, 0, tzinfo=timezone.utc)
+    records = []
+    for week in range(52 * years):
+        for slot in range(per_week):
+            day = start + timedelta(weeks=week, days=slot * 3)
+            emp = rng.choice(EMPLACEMENTS)
+            for member_id in range(members):
+                if rng.random() < rate:
+                    ts = day + timedelta(minutes=rng.randint(0, 180), microseconds=rng.randint(0, 999999))
+                    records.append({
+                        "user": {"username": f"member_{member_id}"},
+                        "member_id": f"m{member_id}",
+                        "emplacement": emp,
+                        "timestamp": ts.isoformat(),
+                    })
+    return records
+
+
+def legacy_sessions(attendance_records):
+    unique_sessions = {}
+    for row in attendance_records:
+        emp = row.get("emplacement")
+        ts = row.get("timestamp")
+        if not emp or not ts:
+            continue
+        ts_parsed = parse(ts)
+        key = (emp, ts_parsed.date())
+        if key not in unique_sessions or ts_parsed > parse(unique_sessions[key]):
+            unique_sessions[key] = ts
+
+    member_sessions = defaultdict(set)
+    for row in attendance_records:
+        member_id = row.get("member_id")
+        emp = row.get("emplacement")
+        ts = row.get("timestamp")
+        if not member_id or not emp or not ts:
+            continue
+        member_sessions[member_id].add((emp, parse(ts).date()))
+    return unique_sessions, member_sessions
+
+
+def legacy_member_loop(members, attendance_records, unique_sessions, member_sessions):
+    total_sessions = len(unique_sessions)
+    for member in members:
+        member_id = member.get("id")
+        present_count = len(member_sessions.get(member_id, set()))
+        member['attendance_count'] = present_count
+        member['absence_count'] = total_sessions - present_count
+        member_last_attendance = None
+        for row in attendance_records:
+            if row.get("member_id") == member_id:
+                ts_parsed = parse(row.get("timestamp"))
+                if not member_last_attendance or ts_parsed > member_last_attendance:
+                    member_last_attendance = ts_parsed
+        if member_last_attendance:
+            last_date = member_last_attendance.date()
+            member['not_seen'] = sum(1 for d in [parse(ts).date() for ts in unique_sessions.values()] if d > last_date)
+        else:
+            member['not_seen'] = total_sessions
+
+
+def index_member_stats(members, attendance_records):
+    index = AttendanceIndex.build(AttendanceStore.from_rows(attendance_records))
+    for member in members:
+        member_id = member.get("id")
+        member['attendance_count'] = index.attendance_count(member_id)
+        member['absence_count'] = index.absence_count(member_id)
+        member['not_seen'] = index.not_seen(member_id)
+
+
+def index_state(index):
+    """Index contents by session key and member id; session numbering depends on the deltas."""
+    store = index.store
+    members, sessions = AttendanceIndex.split_pairs(index.pair_keys)
+    return (
+        {key: store.raw_timestamps[row] for key, row in zip(index.session_keys.tolist(), index.session_latest_rows.tolist())},
+        sorted((store.member_ids[m], index.session_keys[s]) for m, s in zip(members.tolist(), sessions.tolist())),
+        dict(zip(store.member_ids, index.member_counts.tolist())),
+        dict(zip(store.member_ids, index.member_last_seen.tolist())),
+        index.rows_indexed,
+    )
+
+
+def check_incremental(records, chunks=7):
+    """extend() over deltas, some of them with no usable session, must match one build of the same rows."""
+    unusable = [
+        {"member_id": "m0", "user": {"username": "member_0"}, "emplacement": None, "timestamp": None},
+        {"member_id": "m1", "user": {"username": "member_1"}, "emplacement": "", "timestamp": records[0]["timestamp"]},
+        {"member_id": "late", "user": {"username": "late"}, "emplacement": None, "timestamp": records[-1]["timestamp"]},
+    ]
+    store = AttendanceStore()
+    index = AttendanceIndex(store)
+    step = len(records) // chunks + 1
+    for i in range(0, len(records), step):
+        store.append(records[i:i + step])
+        index.extend()
+        store.append(unusable[:1])
+        index.extend()
+    store.append(unusable[1:])
+    fresh, updated = index.extend()
+    assert len(fresh) == len(updated) == 0
+
+    rows = []
+    for i in range(0, len(records), step):
+        rows += records[i:i + step] + unusable[:1]
+    full = AttendanceIndex.build(AttendanceStore.from_rows(rows + unusable[1:]))
+    assert index_state(index) == index_state(full), "incremental index differs from a full build"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=500)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--per-week", type=int, default=2)
+    parser.add_argument("--rate", type=float, default=0.7)
+    parser.add_argument("--legacy-members", type=int, default=25)
+    args = parser.parse_args()
+
+    records = make_records(args.members, args.years, args.per_week, args.rate)
+    roster = [{"id": f"m{i}"} for i in range(args.members)]
+    print(f"{args.members} members, {len(records)} attendance rows")
+    check_incremental(records)
+
+    start = time.perf_counter()
+    index_member_stats(roster, records)
+    index_s = time.perf_counter() - start
+
+    # Session passes are paid once; the per-member scans scale with the roster
+    start = time.perf_counter()
+    unique_sessions, member_sessions = legacy_sessions(records)
+    legacy_fixed_s = time.perf_counter() - start
+
+    sample = [{"id": f"m{i}"} for i in range(min(args.legacy_members, args.members))]
+    start = time.perf_counter()
+    legacy_member_loop(sample, records, unique_sessions, member_sessions)
+    per_member = (time.perf_counter() - start) / len(sample)
+    assert sample == roster[: len(sample)], "index results differ from legacy"
+    legacy_s = legacy_fixed_s + per_member * args.members
+
+    print(f"legacy : {legacy_s:8.2f} s  (measured on {len(sample)} members, extrapolated)")
+    print(f"index  : {index_s:8.2f} s")
+    print(f"speedup: {legacy_s / index_s:8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
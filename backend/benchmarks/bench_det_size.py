@@ -0,0 +1,101 @@
+"""
+Latency vs recognition accuracy per detector input size.
+
+Enrolls every image of --gallery with the full 640 pipeline, then runs
+each sample through the fast pipeline at every det_size and checks that
+the match is the expected identity. Samples come from --samples, where
+files are named <identity>.jpg or <identity>__<anything>.jpg. By default
+the gallery images are re-encoded as low-quality JPEGs, like the phone
+client sends (quality 0.1).
+
+Usage (from backend/):
+    python benchmarks/bench_det_size.py
+    python benchmarks/bench_det_size.py --samples samples/ --sizes 160 224 320 480 640
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import cv2
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from face_gallery import EmbeddingGallery
+from face_pipeline import PIPELINES, PipelineProfile, detect_faces, embed_crops
+from inference_profile import get_profile
+
+
+def read_folder(folder):
+    for filename in sorted(os.listdir(folder)):
+        name, ext = os.path.splitext(filename)
+        if ext.lower() not in (".jpg", ".png"):
+            continue
+        img = cv2.imread(os.path.join(folder, filename))
+        if img is not None:
+            yield name.split("__")[0], img
+
+
+def degrade(img, quality):
+    ok, buf = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return cv2.imdecode(buf, cv2.IMREAD_COLOR) if ok else img
+
+
+def embed_one(face_app, img, pipeline):
+    faces = detect_faces(face_app, img, pipeline)
+    if not faces:
+        return None
+    # Largest face, like a single-person login picture
+    face = max(faces, key=lambda f: (f.bbox[2] - f.bbox[0]) * (f.bbox[3] - f.bbox[1]))
+    return embed_crops(face_app, [face.crop])[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--gallery", default=os.path.join(BACKEND_DIR, "known_faces"))
+    parser.add_argument("--samples", help="labelled sample folder (default: degraded gallery images)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[160, 224, 320, 480, 640])
+    parser.add_argument("--quality", type=int, default=10, help="JPEG quality for default samples")
+    parser.add_argument("--profile", default=None, help="inference profile (default: INFERENCE_PROFILE)")
+    args = parser.parse_args()
+
+    face_app = get_profile(args.profile).build_face_app(det_size=PIPELINES["full"].det_size)
+
+    gallery = EmbeddingGallery()
+    for name, img in read_folder(args.gallery):
+        img = cv2.copyMakeBorder(img, 50, 50, 50, 50, cv2.BORDER_CONSTANT, value=[255, 255, 255])
+        emb = embed_one(face_app, img, PIPELINES["full"])
+        if emb is not None:
+            gallery.add(name, emb)
+
+    if args.samples:
+        samples = list(read_folder(args.samples))
+    else:
+        samples = [(name, degrade(img, args.quality)) for name, img in read_folder(args.gallery)]
+    samples = [(name, img) for name, img in samples if name in gallery]
+    if not samples:
+        sys.exit("No labelled samples with an enrolled identity")
+
+    print(f"{len(gallery)} enrolled, {len(samples)} samples")
+    print(f"{'det_size':>8} {'mean ms':>8} {'p95 ms':>7} {'detected':>9} {'accuracy':>9}")
+    for size in args.sizes:
+        pipeline = PipelineProfile(f"fast{size}", (size, size), ("detection", "recognition"))
+        times, detected, correct = [], 0, 0
+        for name, img in samples:
+            t0 = time.perf_counter()
+            emb = embed_one(face_app, img, pipeline)
+            times.append(time.perf_counter() - t0)
+            if emb is None:
+                continue
+            detected += 1
+            correct += gallery.match(emb) == name
+        times.sort()
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+        print(f"{size:>8} {statistics.mean(times) * 1000:8.1f} {p95 * 1000:7.1f} "
+              f"{detected / len(samples):9.1%} {correct / len(samples):9.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Micro-benchmark: EmbeddingGallery vs the per-identity cosine loop that
+match_face used before.
+
+Usage (from backend/):
+    python benchmarks/bench_gallery.py
+    python benchmarks/bench_gallery.py --sizes 100 1000 --faces 5
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from face_gallery import EmbeddingGallery
+
+try:
+    from scipy.spatial.distance import cosine
+except ImportError:  # same maths, without the scipy dependency
+    def cosine(u, v):
+        return 1.0 - float(np.dot(u, v) / (np.linalg.norm(u) * np.linalg.norm(v)))
+
+
+DIM = 512
+
+
+def legacy_match(known_faces, embedding, threshold=0.59999):
+    embedding = embedding / np.linalg.norm(embedding)
+    best_match = None
+    best_distance = float("inf")
+    for name, known_emb in known_faces.items():
+        dist = cosine(embedding, known_emb)
+        if dist < threshold and dist < best_distance:
+            best_match = name
+            best_distance = dist
+    return best_match
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+    parser.add_argument("--faces", type=int, default=3, help="faces per frame")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'identities':>10} {'loop ms':>10} {'gallery ms':>11} {'speedup':>8}")
+    for size in args.sizes:
+        embs = rng.standard_normal((size, DIM)).astype(np.float32)
+        embs /= np.linalg.norm(embs, axis=1, keepdims=True)
+        names = [f"member_{i}" for i in range(size)]
+        known_faces = dict(zip(names, embs))
+
+        gallery = EmbeddingGallery()
+        gallery.load(zip(names, embs))
+
+        # Queries are noisy copies of registered members so that matches exist
+        picks = rng.integers(0, size, args.faces)
+        queries = embs[picks] + 0.05 * rng.standard_normal((args.faces, DIM)).astype(np.float32)
+
+        expected = [legacy_match(known_faces, q) for q in queries]
+        assert gallery.match_batch(queries) == expected, "gallery disagrees with legacy loop"
+
+        # The loop is slow at large sizes; fewer repeats keep the run short
+        loop_repeat = 1 if size >= 10_000 else args.repeat
+        loop_s = timed(lambda: [legacy_match(known_faces, q) for q in queries], loop_repeat)
+        gallery_s = timed(lambda: gallery.match_batch(queries), args.repeat)
+        print(f"{size:>10} {loop_s * 1000:>10.2f} {gallery_s * 1000:>11.3f} {loop_s / gallery_s:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
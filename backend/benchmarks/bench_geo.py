@@ -0,0 +1,92 @@
+"""
+Micro-benchmark: geo.haversine / geo.Geofence vs the array-library haversine
+that /v2/recognize used before (CuPy when installed, NumPy otherwise).
+
+Usage (from backend/):
+    python benchmarks/bench_geo.py
+    python benchmarks/bench_geo.py --calls 20000 --points 10000 --sites 4
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geo import Geofence, distance_matrix, haversine
+
+try:
+    import cupy as xp
+except ImportError:
+    xp = np
+
+
+def legacy_haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(float, [lat1, lon1, lat2, lon2])
+    if lat1 == lat2 and lon1 == lon2:
+        return 0.0
+    R = 6371008.8
+    lat1_rad = xp.radians(xp.asarray(lat1, dtype=xp.float64))
+    lon1_rad = xp.radians(xp.asarray(lon1, dtype=xp.float64))
+    lat2_rad = xp.radians(xp.asarray(lat2, dtype=xp.float64))
+    lon2_rad = xp.radians(xp.asarray(lon2, dtype=xp.float64))
+    dlat = lat2_rad - lat1_rad
+    dlon = lon2_rad - lon1_rad
+    a = xp.sin(dlat / 2.0) ** 2 + xp.cos(lat1_rad) * xp.cos(lat2_rad) * xp.sin(dlon / 2.0) ** 2
+    a = xp.clip(a, 0.0, 1.0)
+    c = 2.0 * xp.arctan2(xp.sqrt(a), xp.sqrt(1.0 - a))
+    return round(float(R * c), 1)
+
+
+def random_points(n, rng, center=(-18.8792, 47.5079), spread=0.02):
+    return [(center[0] + rng.uniform(-spread, spread), center[1] + rng.uniform(-spread, spread)) for _ in range(n)]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--points", type=int, default=10000)
+    parser.add_argument("--sites", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    sites = random_points(args.sites, rng)
+    points = random_points(max(args.calls, args.points), rng)
+    site = sites[0]
+    print(f"backend for legacy: {xp.__name__}")
+
+    # Single point against one site, as /v2/recognize does
+    calls = points[: args.calls]
+    legacy, legacy_s = timed(lambda: [legacy_haversine(site[0], site[1], lat, lon) for lat, lon in calls])
+    scalar, scalar_s = timed(lambda: [haversine(site[0], site[1], lat, lon) for lat, lon in calls])
+    fence = Geofence([site], radius=100)
+    fenced, fence_s = timed(lambda: [fence.distance(lat, lon) for lat, lon in calls])
+    assert np.allclose(legacy, scalar, atol=0.11) and scalar == fenced, "scalar results differ"
+    print(f"1 point x 1 site ({args.calls} calls)")
+    print(f"  legacy   : {legacy_s / args.calls * 1e6:8.2f} us/call")
+    print(f"  haversine: {scalar_s / args.calls * 1e6:8.2f} us/call  ({legacy_s / scalar_s:.0f}x)")
+    print(f"  Geofence : {fence_s / args.calls * 1e6:8.2f} us/call  ({legacy_s / fence_s:.0f}x)")
+
+    # Many points against several sites
+    batch = points[: args.points]
+    legacy_m, legacy_s = timed(
+        lambda: np.array([[legacy_haversine(s[0], s[1], lat, lon) for s in sites] for lat, lon in batch])
+    )
+    matrix, matrix_s = timed(distance_matrix, batch, sites)
+    assert np.allclose(legacy_m, matrix, atol=0.11), "batch results differ"
+    print(f"{args.points} points x {args.sites} sites")
+    print(f"  legacy loop    : {legacy_s * 1e3:8.1f} ms")
+    print(f"  distance_matrix: {matrix_s * 1e3:8.1f} ms  ({legacy_s / matrix_s:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
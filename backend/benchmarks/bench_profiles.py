@@ -0,0 +1,107 @@
+"""
+Benchmark the inference profiles on the same image set.
+
+Reports frames per second and per-stage latency (detection, recognition,
+liveness) for each profile. The cpu profile needs the INT8 pack from
+quantize_models.py.
+
+Usage (from backend/):
+    python benchmarks/bench_profiles.py --images known_faces --profiles gpu cpu
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import cv2
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def load_images(folder, limit):
+    images = []
+    for filename in sorted(os.listdir(folder)):
+        if os.path.splitext(filename)[1].lower() not in (".jpg", ".png"):
+            continue
+        img = cv2.imread(os.path.join(folder, filename))
+        if img is not None:
+            images.append(img)
+        if len(images) >= limit:
+            break
+    return images
+
+
+def ms(values):
+    if not values:
+        return "   -  "
+    return f"{statistics.mean(values) * 1000:6.1f}"
+
+
+def run_profile(name, images, warmup):
+    # Profiles are module-level state (liveness loads at import), so each one runs in-process alone
+    os.environ["INFERENCE_PROFILE"] = name
+    from inference_profile import get_profile
+    from face_pipeline import detect_faces, embed_crops
+    from liveness import liveness_check
+
+    profile = get_profile(name)
+    face_app = profile.build_face_app(det_size=(640, 640))
+
+    for img in images[:warmup]:
+        faces = detect_faces(face_app, img)
+        if faces:
+            embed_crops(face_app, [f.crop for f in faces])
+
+    detect_t, embed_t, live_t = [], [], []
+    start = time.perf_counter()
+    for img in images:
+        t0 = time.perf_counter()
+        faces = detect_faces(face_app, img)
+        detect_t.append(time.perf_counter() - t0)
+        if not faces:
+            continue
+        t0 = time.perf_counter()
+        embed_crops(face_app, [f.crop for f in faces])
+        embed_t.append(time.perf_counter() - t0)
+        x1, y1, x2, y2 = map(int, faces[0].bbox)
+        t0 = time.perf_counter()
+        liveness_check(img, (x1, y1, x2 - x1, y2 - y1), use_screen_guard=False)
+        live_t.append(time.perf_counter() - t0)
+    total = time.perf_counter() - start
+
+    print(f"{name:>8} {len(images) / total:8.1f} {ms(detect_t)} {ms(embed_t)} {ms(live_t)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", default=os.path.join(BACKEND_DIR, "known_faces"))
+    parser.add_argument("--profiles", nargs="+", default=["gpu", "cpu"])
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--only", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    images = load_images(args.images, args.limit)
+    if not images:
+        sys.exit(f"No images found in {args.images}")
+
+    if args.only:
+        run_profile(args.only, images, args.warmup)
+        return
+
+    print(f"{len(images)} images from {args.images}")
+    print(f"{'profile':>8} {'fps':>8} {'det ms':>6} {'rec ms':>6} {'live ms':>7}")
+    for name in args.profiles:
+        subprocess.run(
+            [sys.executable, __file__, "--only", name, "--images", args.images,
+             "--limit", str(args.limit), "--warmup", str(args.warmup)],
+            cwd=BACKEND_DIR,
+            check=False,
+        )
+
+
+if __name__ == "__main__":
+    main()
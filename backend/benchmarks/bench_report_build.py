@@ -0,0 +1,148 @@
+"""
+Benchmark: /v2/download report from memory (report_builder.build_report)
+vs the file round trip it replaced: write tmi_lisitra.xlsx and the
+tmi_presence.xlsx export, read both back and build the split workbook
+(the export_attendance + merge_attendance modules, kept below). The round
+trip measured here already skips the four intermediate tracker workbooks
+merge_attendance used to write and re-read, so the real saving was larger.
+
+Reports wall time and bytes written to disk for each path; both run in a
+temporary directory and must produce the same workbook.
+
+Usage (from backend/):
+    python benchmarks/bench_report_build.py
+    python benchmarks/bench_report_build.py --members 300 --years 2
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from babel.dates import format_date
+from openpyxl.styles import Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from attendance_store import AttendanceStore
+from bench_attendance_index import make_records
+from attendance_pivot import AttendancePivot
+from report_builder import REPORT_PATH, build_report, write_split_workbook
+
+MALAGASY_MONTHS = {
+    "janoary": 1, "febroary": 2, "martsa": 3, "aprily": 4, "mey": 5, "jona": 6,
+    "jolay": 7, "aogositra": 8, "septambra": 9, "oktobra": 10, "novambra": 11, "desambra": 12,
+}
+
+
+def dir_bytes(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def sheet_values(path):
+    wb = openpyxl.load_workbook(path)
+    return {ws.title: [list(row) for row in ws.iter_rows(values_only=True)] for ws in wb.worksheets}
+
+
+def export_attendance(store):
+    """tmi_presence.xlsx as export_attendance wrote it: chronological rows, styled header, auto widths."""
+    order = np.argsort(store.timestamps, kind="stable")
+    days = store.timestamps[order].astype("datetime64[D]")
+    unique_days, day_of_row = np.unique(days, return_inverse=True)
+    labels = np.array(
+        ["" if np.isnat(day) else format_date(day.item(), format="d MMMM y", locale="mg_MG") for day in unique_days],
+        dtype=object,
+    )
+    df = pd.DataFrame({
+        "Anarana": [store.username(code) for code in store.member_codes[order].tolist()],
+        "Toerana": [store.emplacement(code) for code in store.emplacement_codes[order].tolist()],
+        "Daty": labels[day_of_row.ravel()],
+    })
+    thin = Side(style="thin")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    with pd.ExcelWriter("tmi_presence.xlsx", engine="openpyxl") as writer:
+        df.to_excel(writer, index=False, sheet_name="tmi_presence")
+        sheet = writer.sheets["tmi_presence"]
+        for cell in sheet[1]:
+            cell.font = Font(bold=True, color="FFFFFF")
+            cell.fill = PatternFill("solid", fgColor="4F81BD")
+            cell.border = border
+        for col in sheet.columns:
+            max_length = 0
+            for cell in col:
+                if cell.value:
+                    cell.border = border
+                    max_length = max(max_length, len(str(cell.value)))
+            sheet.column_dimensions[get_column_letter(col[0].column)].width = max_length + 2
+
+
+def parse_malagasy_date(value):
+    """"7 Septambra 2024" back to a Timestamp, for sorting."""
+    parts = str(value).strip().split() if not pd.isna(value) else []
+    if len(parts) < 3:
+        return None
+    return pd.Timestamp(year=int(parts[2]), month=MALAGASY_MONTHS.get(parts[1].lower(), 1), day=int(parts[0]))
+
+
+def merge_attendance():
+    """The split report from the two files on disk, as merge_attendance built it."""
+    df_list = pd.read_excel("tmi_lisitra.xlsx")
+    df_attendance = pd.read_excel("tmi_presence.xlsx")
+    df_attendance["_parsed_date"] = df_attendance["Daty"].apply(parse_malagasy_date)
+    write_split_workbook(AttendancePivot.from_frames(df_list, df_attendance), REPORT_PATH)
+
+
+def round_trip(store, members):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Feo", "Anarana"])
+    for member in members:
+        ws.append([member["voice"], member["username"]])
+    wb.save("tmi_lisitra.xlsx")
+    export_attendance(store)
+    merge_attendance()
+
+
+def measure(fn, *args):
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            start = time.perf_counter()
+            fn(*args)
+            elapsed = time.perf_counter() - start
+            return elapsed, dir_bytes(tmp), sheet_values(REPORT_PATH)
+        finally:
+            os.chdir(cwd)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=120)
+    parser.add_argument("--years", type=int, default=2)
+    parser.add_argument("--per-week", type=int, default=2)
+    parser.add_argument("--rate", type=float, default=0.7)
+    args = parser.parse_args()
+
+    store = AttendanceStore.from_rows(make_records(args.members, args.years, args.per_week, args.rate))
+    rng = random.Random(1)
+    members = [{"username": f"member_{i}", "voice": rng.randint(1, 5)} for i in range(args.members)]
+
+    legacy_s, legacy_bytes, legacy_report = measure(round_trip, store, members)
+    build_s, build_bytes, report = measure(build_report, store, members)
+    assert report == legacy_report, "in-memory report differs from the file round trip"
+
+    print(f"{args.members} members, {len(store)} attendance rows")
+    print(f"  file round trip: {legacy_s:7.2f} s  {legacy_bytes / 1e6:7.2f} MB written")
+    print(f"  in memory      : {build_s:7.2f} s  {build_bytes / 1e6:7.2f} MB written")
+    print(f"  speedup        : {legacy_s / build_s:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
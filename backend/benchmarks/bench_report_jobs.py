@@ -0,0 +1,94 @@
+"""
+Benchmark: event loop latency while the attendance report builds.
+
+  thread : build_report through asyncio.to_thread, as /v2/download did
+  process: a ReportJobs job (process pool, progress polled like a client)
+
+A probe task sleeps 10 ms in a loop and records how late each wake-up is;
+with the build holding the GIL in a thread, wake-ups (and so every other
+request) are delayed. The same synthetic store and roster are used for
+both, and each run uses an empty report cache.
+
+Usage (from backend/):
+    python benchmarks/bench_report_jobs.py
+    python benchmarks/bench_report_jobs.py --members 1000 --years 3
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from attendance_store import AttendanceStore
+from bench_attendance_index import make_records
+from report_builder import build_report
+from report_cache import ReportCache
+from report_jobs import ReportJobs
+
+TICK = 0.01
+
+
+async def probe(lags, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def measure(build):
+    lags, stop = [], asyncio.Event()
+    task = asyncio.create_task(probe(lags, stop))
+    start = time.perf_counter()
+    await build()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await task
+    lags = np.array(lags) * 1000
+    return elapsed, np.percentile(lags, 50), np.percentile(lags, 99), lags.max()
+
+
+async def run(store, members):
+    with tempfile.TemporaryDirectory() as tmp:
+        async def in_thread():
+            await asyncio.to_thread(build_report, store, members, os.path.join(tmp, "thread.xlsx"))
+
+        jobs = ReportJobs(ReportCache(os.path.join(tmp, "cache")), workers=1)
+        # Worker start-up is paid once per server, not per report
+        await asyncio.get_running_loop().run_in_executor(jobs._executor(), time.sleep, 0)
+
+        async def in_process():
+            job = jobs.submit(ReportCache.version(store, members), store, members)
+            while jobs.get(job.id).active:
+                await asyncio.sleep(0.2)
+            assert job.state == "done", job.error
+
+        for name, build in (("thread", in_thread), ("process", in_process)):
+            elapsed, p50, p99, worst = await measure(build)
+            print(f"  {name:7}: {elapsed:6.2f} s build   loop lag p50 {p50:6.1f} ms  p99 {p99:7.1f} ms  max {worst:7.1f} ms")
+        jobs.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=300)
+    parser.add_argument("--years", type=int, default=2)
+    parser.add_argument("--per-week", type=int, default=2)
+    parser.add_argument("--rate", type=float, default=0.7)
+    args = parser.parse_args()
+
+    store = AttendanceStore.from_rows(make_records(args.members, args.years, args.per_week, args.rate))
+    rng = random.Random(1)
+    members = [{"username": f"member_{i}", "voice": rng.randint(1, 5)} for i in range(args.members)]
+    print(f"{args.members} members, {len(store)} attendance rows")
+    asyncio.run(run(store, members))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmark: peak RSS and wall time of writing the split attendance report.
+
+  stream : report_builder.write_split_workbook (write-only workbook, rows
+           sorted before writing, shared named styles, widths from data)
+  cells  : the writer merge_attendance used before: a regular workbook
+           filled cell by cell with fresh style objects, rows re-read and
+           re-styled to sort them by Anarana, columns walked to auto-size
+
+Each writer runs in its own child process on the same synthetic pivot
+(default 1000 members x 300 sessions) so ru_maxrss is not shared. "before"
+is the child's RSS once the pivot is built, "peak" its maximum RSS.
+
+Usage (from backend/):
+    python benchmarks/bench_report_memory.py
+    python benchmarks/bench_report_memory.py --members 1000 --sessions 300
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from copy import copy
+from datetime import date, timedelta
+
+import numpy as np
+import openpyxl
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from attendance_pivot import AttendancePivot
+from report_builder import FEO_SHEETS, write_split_workbook
+
+EMPLACEMENTS = ["Ambohijatovo", "Analakely", "Isotry", "Andravoahangy"]
+
+
+def make_pivot(members, sessions, rate, seed=0):
+    rng = np.random.default_rng(seed)
+    start = date(2020, 1, 5)
+    dates = [(start + timedelta(days=3 * i)).strftime("%d %B %Y") for i in range(sessions)]
+    feo = np.arange(members) % len(FEO_SHEETS) + 1
+    names = [f"member_{i}" for i in rng.permutation(members).tolist()]
+    present = rng.random((members, sessions)) < rate
+    emplacements = [EMPLACEMENTS[i] for i in rng.integers(0, len(EMPLACEMENTS), sessions).tolist()]
+    return AttendancePivot(feo, names, dates, present, emplacements)
+
+
+def write_cells(pivot, path):
+    thin = Side(border_style="thin", color="000000")
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for feo_value, sheet_name in FEO_SHEETS.items():
+        rows = pivot.rows_for(feo_value)
+        if not len(rows):
+            continue
+        ws = wb.create_sheet(title=sheet_name)
+        frame = pivot.to_frame(rows)
+        for col, value in enumerate(["", ""] + pivot.emplacements + [""], 1):
+            cell = ws.cell(row=1, column=col, value=value)
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+            cell.border = Border(top=thin, left=thin, right=thin, bottom=thin)
+            cell.font = Font(bold=True)
+        for col, value in enumerate(frame.columns, 1):
+            cell = ws.cell(row=2, column=col, value=value)
+            cell.font = Font(bold=True)
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+            cell.border = Border(top=thin, left=thin, right=thin, bottom=thin)
+        for r_idx, values in enumerate(frame.itertuples(index=False), start=3):
+            for c_idx, value in enumerate(values, start=1):
+                cell = ws.cell(row=r_idx, column=c_idx, value=value)
+                cell.alignment = Alignment(horizontal="center", vertical="center")
+                cell.border = Border(top=thin, left=thin, right=thin, bottom=thin)
+                if value == "P":
+                    cell.fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
+                elif value == "A":
+                    cell.fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+        ws.append(["", ""] + pivot.rapport(rows) + [""])
+        for col in range(1, ws.max_column + 1):
+            cell = ws.cell(row=ws.max_row, column=col)
+            cell.font = Font(bold=True, color="1E90FF")
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+            cell.border = Border(top=thin, left=thin, right=thin, bottom=thin)
+        for col in ws.columns:
+            max_length = max((len(str(cell.value)) for cell in col if cell.value), default=0)
+            ws.column_dimensions[get_column_letter(col[0].column)].width = max_length + 2
+        rows_to_sort = []
+        for row_idx in range(3, ws.max_row):
+            rows_to_sort.append([
+                (cell.value, copy(cell.font), copy(cell.fill), copy(cell.alignment), copy(cell.border))
+                for cell in ws[row_idx]
+            ])
+        rows_to_sort.sort(key=lambda row: str(row[1][0]).lower() if row[1][0] else "")
+        for row_idx, row_data in enumerate(rows_to_sort, start=3):
+            for cell, (value, font, fill, alignment, border) in zip(ws[row_idx], row_data):
+                cell.value, cell.font, cell.fill, cell.alignment, cell.border = value, font, fill, alignment, border
+        ws.auto_filter.ref = f"A2:{get_column_letter(ws.max_column)}{ws.max_row - 1}"
+        ws.freeze_panes = "C3"
+        ws.column_dimensions["A"].hidden = True
+    wb.save(path)
+
+
+WRITERS = {"stream": write_split_workbook, "cells": write_cells}
+
+
+def max_rss_mb():
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(args):
+    pivot = make_pivot(args.members, args.sessions, args.rate)
+    before = max_rss_mb()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "report.xlsx")
+        start = time.perf_counter()
+        WRITERS[args.child](pivot, path)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(path)
+    print(f"{elapsed:.3f} {before:.1f} {max_rss_mb():.1f} {size}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--rate", type=float, default=0.7)
+    parser.add_argument("--child", choices=WRITERS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args)
+        return
+
+    print(f"{args.members} members x {args.sessions} sessions")
+    for name in WRITERS:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", name,
+             "--members", str(args.members), "--sessions", str(args.sessions), "--rate", str(args.rate)],
+            check=True, capture_output=True, text=True,
+        ).stdout.split()
+        elapsed, before, peak, size = float(out[0]), float(out[1]), float(out[2]), int(out[3])
+        print(f"  {name:6}: {elapsed:7.2f} s  peak RSS {peak:7.1f} MB (+{peak - before:6.1f} MB while writing)  {size / 1e6:5.2f} MB file")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark: AttendancePivot vs the per-date / per-member loops that
+merge_attendance used to build the P/A grid, totals, emplacement row and
+rapport percentages.
+
+Runs on in-memory frames (no Excel I/O) at a realistic roster and at 10x
+that roster. The legacy presence loop is O(names x dates x rows), so it
+runs on --legacy-dates dates and is extrapolated to all of them (the
+10x legacy leg still takes a few minutes).
+
+Usage (from backend/):
+    python benchmarks/bench_report_pivot.py
+    python benchmarks/bench_report_pivot.py --members 120 --years 2 --legacy-dates 2
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from attendance_pivot import AttendancePivot
+from bench_attendance_index import make_records
+
+FEO_VALUES = [1, 2, 3, 4, 5]
+
+
+def make_frames(members, years, per_week, rate):
+    records = make_records(members, years, per_week, rate)
+    df_attendance = pd.DataFrame({
+        "Anarana": [r["user"]["username"] for r in records],
+        "Toerana": [r["emplacement"] for r in records],
+        "_parsed_date": pd.to_datetime([r["timestamp"][:10] for r in records]),
+    })
+    df_attendance["Daty"] = df_attendance["_parsed_date"].dt.strftime("%d/%m/%Y")
+    df_attendance = df_attendance.sort_values(by="_parsed_date", kind="stable")
+    df_list = pd.DataFrame({
+        "Feo": [FEO_VALUES[i % len(FEO_VALUES)] for i in range(members)],
+        "Anarana": [f"member_{i}" for i in range(members)],
+    })
+    return df_list, df_attendance
+
+
+def legacy_merge(df_list, df_attendance):
+    merged_rows = []
+    for _, row in df_list.iterrows():
+        matches = df_attendance[df_attendance['Anarana'] == row['Anarana']]
+        if not matches.empty:
+            for _, match in matches.iterrows():
+                merged_rows.append({'Feo': row['Feo'], 'Anarana': row['Anarana'], 'Toerana': match['Toerana'], 'Daty': match['Daty']})
+        else:
+            merged_rows.append({'Feo': row['Feo'], 'Anarana': row['Anarana'], 'Toerana': '', 'Daty': ''})
+    return pd.DataFrame(merged_rows)
+
+
+def legacy_dates(df_merged, result, dates):
+    columns = {}
+    for date in dates:
+        columns[date] = result['Anarana'].apply(
+            lambda name: 'P' if not df_merged[(df_merged['Anarana'] == name) & (df_merged['Daty'] == date)].empty else 'A'
+        )
+        loc = df_merged[df_merged['Daty'] == date]['Toerana'].dropna()
+        columns[date, "place"] = loc.iloc[0] if not loc.empty else ''
+    for date in dates:
+        result[date] = columns[date]
+    result["total"] = result[dates].apply(lambda row: sum(val == "P" for val in row), axis=1)
+    for feo in FEO_VALUES:
+        sheet = result[result["Feo"] == feo]
+        for date in dates:
+            present = sum(1 for val in sheet[date] if isinstance(val, str) and val.lower() == "p")
+            f"{present / len(sheet) * 100 if len(sheet) else 0:.1f}%"
+
+
+def pivot_report(df_list, df_attendance):
+    pivot = AttendancePivot.from_frames(df_list, df_attendance)
+    frame = pivot.to_frame()
+    rapports = [pivot.rapport(pivot.rows_for(feo)) for feo in FEO_VALUES]
+    return pivot, frame, rapports
+
+
+def run(members, years, per_week, rate, legacy_date_count):
+    df_list, df_attendance = make_frames(members, years, per_week, rate)
+    dates = df_attendance.drop_duplicates("Daty")["Daty"].tolist()
+
+    start = time.perf_counter()
+    pivot, _, _ = pivot_report(df_list, df_attendance)
+    pivot_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    df_merged = legacy_merge(df_list, df_attendance)
+    merge_s = time.perf_counter() - start
+    sample = dates[:legacy_date_count]
+    result = df_merged[['Feo', 'Anarana']].drop_duplicates().reset_index(drop=True)
+    start = time.perf_counter()
+    legacy_dates(df_merged, result, sample)
+    legacy_s = merge_s + (time.perf_counter() - start) / len(sample) * len(dates)
+
+    expected = pivot.to_frame()[sample]
+    assert (result[sample].to_numpy() == expected.to_numpy()).all(), "pivot differs from legacy"
+
+    print(f"{members} members x {len(dates)} dates ({len(df_attendance)} attendance rows)")
+    print(f"  legacy : {legacy_s:8.2f} s  (measured on {len(sample)} dates, extrapolated)")
+    print(f"  pivot  : {pivot_s:8.3f} s")
+    print(f"  speedup: {legacy_s / pivot_s:8.0f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=120)
+    parser.add_argument("--years", type=int, default=2)
+    parser.add_argument("--per-week", type=int, default=2)
+    parser.add_argument("--rate", type=float, default=0.7)
+    parser.add_argument("--legacy-dates", type=int, default=2)
+    args = parser.parse_args()
+
+    for scale in (1, 10):
+        run(args.members * scale, args.years, args.per_week, args.rate, args.legacy_dates)
+
+
+if __name__ == "__main__":
+    main()
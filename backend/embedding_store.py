@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def file_sha1(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def bytes_sha1(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Packed on-disk store for face embeddings.
+
+    folder/
+      embeddings.npy  float32 matrix (capacity, dim), one row per embedding,
+                      preallocated so that appends write in place
+      index.jsonl     append-only log of row operations:
+                      {"op": "add", "row": 3, "name": "...", "hash": "..."}
+                      {"op": "del", "name": "..."}
+                      {"op": "mv", "name": "...", "to": "..."}
+
+    Startup is one np.load(mmap_mode="r") plus a replay of the index log.
+    Deletes are tombstones; rewrite() compacts the matrix and the log.
+    """
+
+    MATRIX_FILE = "embeddings.npy"
+    INDEX_FILE = "index.jsonl"
+
+    def __init__(self, folder: str, initial_capacity: int = 256):
+        self.folder = folder
+        self.initial_capacity = initial_capacity
+        self.matrix_path = os.path.join(folder, self.MATRIX_FILE)
+        self.index_path = os.path.join(folder, self.INDEX_FILE)
+        self._lock = threading.Lock()
+        self._used: Optional[int] = None
+        os.makedirs(folder, exist_ok=True)
+
+    # ----- reading -----
+
+    def _replay_index(self) -> Tuple[Dict[str, Tuple[int, str]], int]:
+        """Return {name: (row, hash)} for live rows and the number of rows used."""
+        live: Dict[str, Tuple[int, str]] = {}
+        used = 0
+        if not os.path.exists(self.index_path):
+            return live, used
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    op = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn last line after a crash: the row is simply ignored
+                    continue
+                kind = op.get("op")
+                if kind == "add":
+                    live[op["name"]] = (op["row"], op.get("hash", ""))
+                    used = max(used, op["row"] + 1)
+                elif kind == "del":
+                    live.pop(op["name"], None)
+                elif kind == "mv" and op["name"] in live:
+                    live[op["to"]] = live.pop(op["name"])
+        return live, used
+
+    def load(self) -> Tuple[List[str], np.ndarray]:
+        """Names and a (n, dim) float32 matrix of live rows, in row order."""
+        with self._lock:
+            live, used = self._replay_index()
+            if not live or not os.path.exists(self.matrix_path):
+                return [], np.empty((0, 0), dtype=np.float32)
+            matrix = np.load(self.matrix_path, mmap_mode="r")
+            ordered = sorted(live.items(), key=lambda item: item[1][0])
+            names = [name for name, _ in ordered]
+            rows = np.fromiter((row for _, (row, _) in ordered), dtype=np.int64, count=len(ordered))
+            if used > matrix.shape[0]:
+                # Index ahead of the matrix (crash during growth): keep valid rows only
+                keep = rows < matrix.shape[0]
+                names = [n for n, k in zip(names, keep) if k]
+                rows = rows[keep]
+            return names, np.asarray(matrix[rows], dtype=np.float32)
+
+    def entries(self) -> Dict[str, Tuple[str, np.ndarray]]:
+        """{name: (source_hash, embedding)} for live rows."""
+        with self._lock:
+            live, _ = self._replay_index()
+            if not live or not os.path.exists(self.matrix_path):
+                return {}
+            matrix = np.load(self.matrix_path, mmap_mode="r")
+            return {
+                name: (source_hash, np.array(matrix[row], dtype=np.float32))
+                for name, (row, source_hash) in live.items()
+                if row < matrix.shape[0]
+            }
+
+    # ----- writing -----
+
+    def _append_ops(self, ops: List[dict]):
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            for op in ops:
+                f.write(json.dumps(op, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _open_matrix(self, dim: int, needed_rows: int) -> np.memmap:
+        if os.path.exists(self.matrix_path):
+            matrix = np.lib.format.open_memmap(self.matrix_path, mode="r+")
+            if matrix.shape[1] != dim:
+                raise ValueError(f"Embedding dimension {dim} does not match store dimension {matrix.shape[1]}")
+            if needed_rows <= matrix.shape[0]:
+                return matrix
+            capacity = max(needed_rows, matrix.shape[0] * 2)
+            tmp_path = self.matrix_path + ".tmp"
+            grown = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=(capacity, dim))
+            grown[: matrix.shape[0]] = matrix
+            grown.flush()
+            del matrix, grown
+            os.replace(tmp_path, self.matrix_path)
+            return np.lib.format.open_memmap(self.matrix_path, mode="r+")
+
+        capacity = max(needed_rows, self.initial_capacity)
+        return np.lib.format.open_memmap(self.matrix_path, mode="w+", dtype=np.float32, shape=(capacity, dim))
+
+    def append(self, name: str, embedding, source_hash: str = "") -> int:
+        """Write a new row for name; any previous row for name is superseded."""
+        vec = np.asarray(embedding, dtype=np.float32).ravel()
+        with self._lock:
+            if self._used is None:
+                _, self._used = self._replay_index()
+            row = self._used
+            matrix = self._open_matrix(vec.shape[0], row + 1)
+            matrix[row] = vec
+            matrix.flush()
+            del matrix
+            self._append_ops([{"op": "add", "row": row, "name": name, "hash": source_hash}])
+            self._used = row + 1
+            return row
+
+    def tombstone(self, name: str):
+        with self._lock:
+            self._append_ops([{"op": "del", "name": name}])
+
+    def rename(self, old_name: str, new_name: str):
+        with self._lock:
+            self._append_ops([{"op": "mv", "name": old_name, "to": new_name}])
+
+    def rewrite(self, entries: List[Tuple[str, np.ndarray, str]]):
+        """Replace the store with (name, embedding, source_hash) entries, dropping tombstones."""
+        with self._lock:
+            matrix_tmp = self.matrix_path + ".tmp"
+            index_tmp = self.index_path + ".tmp"
+            if entries:
+                dim = np.asarray(entries[0][1]).size
+                capacity = max(len(entries), self.initial_capacity)
+                matrix = np.lib.format.open_memmap(matrix_tmp, mode="w+", dtype=np.float32, shape=(capacity, dim))
+                for row, (_, emb, _) in enumerate(entries):
+                    matrix[row] = np.asarray(emb, dtype=np.float32).ravel()
+                matrix.flush()
+                del matrix
+            with open(index_tmp, "w", encoding="utf-8") as f:
+                for row, (name, _, source_hash) in enumerate(entries):
+                    f.write(json.dumps({"op": "add", "row": row, "name": name, "hash": source_hash}, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            if entries:
+                os.replace(matrix_tmp, self.matrix_path)
+            elif os.path.exists(self.matrix_path):
+                os.remove(self.matrix_path)
+            os.replace(index_tmp, self.index_path)
+            self._used = len(entries)
@@ -0,0 +1,216 @@
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def _normalize_rows(mat: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+
+class EmbeddingGallery:
+    """
+    In-memory gallery of known face embeddings.
+
+    Every embedding is L2-normalized and stored as one row of a contiguous
+    float32 matrix, with a parallel list of names. Matching a batch of query
+    embeddings is a single matrix product instead of one cosine call per
+    registered member.
+
+    A reload that scans the images off the event loop brackets the scan
+    with begin_reload() / finish_reload(): changes made meanwhile are
+    logged and replayed over the scanned entries, so the scan does not undo
+    them.
+    """
+
+    def __init__(self, dim: Optional[int] = None, capacity: int = 64):
+        self._dim = dim
+        self._capacity = capacity
+        self._matrix = np.empty((capacity, dim), dtype=np.float32) if dim else None
+        self._names: List[str] = []
+        self._rows: Dict[str, int] = {}
+        # (method, args) of the changes made since begin_reload(), None when no reload runs
+        self._changes: Optional[List[Tuple[str, tuple]]] = None
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._rows
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._names)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Read-only view of the active rows."""
+        if self._matrix is None:
+            return np.empty((0, self._dim or 0), dtype=np.float32)
+        view = self._matrix[: len(self._names)]
+        view.flags.writeable = False
+        return view
+
+    def get(self, name: str) -> Optional[np.ndarray]:
+        row = self._rows.get(name)
+        if row is None:
+            return None
+        return self._matrix[row].copy()
+
+    def _ensure_capacity(self, dim: int, needed: int):
+        if self._matrix is None:
+            self._dim = dim
+            self._capacity = max(self._capacity, needed)
+            self._matrix = np.empty((self._capacity, dim), dtype=np.float32)
+            return
+        if dim != self._dim:
+            raise ValueError(f"Embedding dimension {dim} does not match gallery dimension {self._dim}")
+        if needed > self._capacity:
+            new_capacity = max(needed, self._capacity * 2)
+            grown = np.empty((new_capacity, self._dim), dtype=np.float32)
+            grown[: len(self._names)] = self._matrix[: len(self._names)]
+            self._matrix = grown
+            self._capacity = new_capacity
+
+    def add(self, name: str, embedding) -> None:
+        """Add an identity, or replace its embedding if it already exists."""
+        vec = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vec)
+        if norm == 0:
+            raise ValueError(f"Empty embedding for {name}")
+        vec = vec / norm
+        self._log("add", name, vec)
+
+        row = self._rows.get(name)
+        if row is not None:
+            self._matrix[row] = vec
+            return
+
+        self._ensure_capacity(vec.shape[0], len(self._names) + 1)
+        row = len(self._names)
+        self._matrix[row] = vec
+        self._names.append(name)
+        self._rows[name] = row
+
+    def load(self, items: Iterable[Tuple[str, np.ndarray]]) -> None:
+        """Replace the whole gallery with the given (name, embedding) pairs."""
+        self.clear()
+        for name, embedding in items:
+            self.add(name, embedding)
+
+    def load_matrix(self, names: List[str], matrix: np.ndarray) -> None:
+        """Replace the whole gallery from a (n, dim) matrix with one row per name."""
+        if len(names) != len(matrix):
+            raise ValueError("names and matrix rows differ in length")
+        if len(set(names)) != len(names):
+            raise ValueError("duplicate names in gallery load")
+        self.clear()
+        if not names:
+            return
+        rows = _normalize_rows(np.asarray(matrix, dtype=np.float32))
+        self._matrix = None
+        self._capacity = len(names)
+        self._ensure_capacity(rows.shape[1], len(names))
+        self._matrix[: len(names)] = rows
+        self._names.extend(names)
+        self._rows.update((name, row) for row, name in enumerate(names))
+
+    def remove(self, name: str) -> bool:
+        """Remove an identity. The last row is moved into the freed slot."""
+        self._log("remove", name)
+        row = self._rows.pop(name, None)
+        if row is None:
+            return False
+        last = len(self._names) - 1
+        if row != last:
+            last_name = self._names[last]
+            self._matrix[row] = self._matrix[last]
+            self._names[row] = last_name
+            self._rows[last_name] = row
+        self._names.pop()
+        return True
+
+    def rename(self, old_name: str, new_name: str) -> bool:
+        row = self._rows.get(old_name)
+        if row is None:
+            return False
+        if new_name in self._rows:
+            raise ValueError(f"{new_name} already exists in gallery")
+        self._log("rename", old_name, new_name)
+        del self._rows[old_name]
+        self._names[row] = new_name
+        self._rows[new_name] = row
+        return True
+
+    def _log(self, method: str, *args) -> None:
+        if self._changes is not None:
+            self._changes.append((method, args))
+
+    def begin_reload(self) -> None:
+        """Start logging add/remove/rename for finish_reload()."""
+        self._changes = []
+
+    def finish_reload(self, items: Iterable[Tuple[str, np.ndarray]]) -> None:
+        """Replace the gallery with items, then replay the changes made since begin_reload()."""
+        changes, self._changes = self._changes or [], None
+        self.load(items)
+        for method, args in changes:
+            if method == "rename" and args[1] in self._rows:
+                # The scan already holds the new name: the old entry is stale
+                self.remove(args[0])
+                continue
+            getattr(self, method)(*args)
+
+    def cancel_reload(self) -> None:
+        self._changes = None
+
+    def clear(self) -> None:
+        self._names.clear()
+        self._rows.clear()
+
+    def distances(self, embeddings) -> np.ndarray:
+        """Cosine distances, shape (queries, identities)."""
+        queries = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        queries = _normalize_rows(queries)
+        if not self._names:
+            return np.empty((queries.shape[0], 0), dtype=np.float32)
+        return 1.0 - queries @ self._matrix[: len(self._names)].T
+
+    def match_batch(self, embeddings, threshold: float = 0.59999) -> List[Optional[str]]:
+        """Best match per query, or None when no identity is closer than threshold."""
+        dist = self.distances(embeddings)
+        if dist.shape[1] == 0:
+            return [None] * dist.shape[0]
+        best = dist.argmin(axis=1)
+        best_dist = dist[np.arange(dist.shape[0]), best]
+        return [
+            self._names[idx] if d < threshold else None
+            for idx, d in zip(best.tolist(), best_dist.tolist())
+        ]
+
+    def match(self, embedding, threshold: float = 0.59999) -> Optional[str]:
+        return self.match_batch(embedding, threshold)[0]
+
+    def topk(self, embeddings, k: int = 5, threshold: Optional[float] = None) -> List[List[Tuple[str, float]]]:
+        """
+        The k closest identities per query as (name, distance), nearest first.
+        When threshold is given, candidates at or beyond it are dropped.
+        """
+        dist = self.distances(embeddings)
+        n = dist.shape[1]
+        if n == 0:
+            return [[] for _ in range(dist.shape[0])]
+        k = min(k, n)
+        part = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        results = []
+        for q in range(dist.shape[0]):
+            cand = part[q]
+            order = cand[np.argsort(dist[q, cand], kind="stable")]
+            hits = []
+            for idx in order.tolist():
+                d = float(dist[q, idx])
+                if threshold is not None and d >= threshold:
+                    break
+                hits.append((self._names[idx], d))
+            results.append(hits)
+        return results
@@ -0,0 +1,90 @@
+import os
+
+from insightface.app.common import Face
+from insightface.utils import face_align
+
+
+class PipelineProfile:
+    """
+    Per-endpoint face pipeline: detector input size and which task models
+    run on each face. modules=None runs every loaded model.
+    """
+
+    def __init__(self, name, det_size, modules=None):
+        self.name = name
+        self.det_size = tuple(det_size)
+        self.modules = tuple(modules) if modules is not None else None
+
+    def runs(self, taskname):
+        return self.modules is None or taskname in self.modules
+
+    def to_dict(self):
+        return {"name": self.name, "det_size": list(self.det_size), "modules": self.modules}
+
+
+def _det_size(value, default):
+    size = int(os.environ.get(value, default))
+    return (size, size)
+
+
+PIPELINES = {
+    # Registration and group photos: full 640 detector and every model
+    "full": PipelineProfile("full", _det_size("FULL_DET_SIZE", 640)),
+    # One close-up face (login, live kiosk): small detector, detection + recognition only
+    "fast": PipelineProfile("fast", _det_size("FAST_DET_SIZE", 320), ("detection", "recognition")),
+}
+
+ENDPOINT_PIPELINES = {
+    "register": os.environ.get("PIPELINE_REGISTER", "full"),
+    "recognize": os.environ.get("PIPELINE_RECOGNIZE", "full"),
+    "login": os.environ.get("PIPELINE_LOGIN", "fast"),
+    "live": os.environ.get("PIPELINE_LIVE", "fast"),
+}
+
+
+def pipeline_for(endpoint):
+    return PIPELINES[ENDPOINT_PIPELINES[endpoint]]
+
+
+def required_modules():
+    """allowed_modules for FaceAnalysis: only what the configured pipelines use (None = all)."""
+    used = [PIPELINES[name] for name in set(ENDPOINT_PIPELINES.values())]
+    if any(p.modules is None for p in used):
+        return None
+    return sorted({m for p in used for m in p.modules})
+
+
+def detect_faces(face_app, img, pipeline=None, max_num=0):
+    """
+    FaceAnalysis.get without the recognition model: detection plus the
+    other task models the pipeline asks for (landmarks, gender/age). Each
+    face also gets the aligned crop the recognition model expects, so
+    embedding can be batched across frames.
+    """
+    if img is None:
+        return []
+    det_size = pipeline.det_size if pipeline is not None else None
+    bboxes, kpss = face_app.det_model.detect(img, input_size=det_size, max_num=max_num, metric='default')
+    if bboxes.shape[0] == 0:
+        return []
+
+    rec_model = face_app.models.get('recognition')
+    faces = []
+    for i in range(bboxes.shape[0]):
+        kps = kpss[i] if kpss is not None else None
+        face = Face(bbox=bboxes[i, 0:4], kps=kps, det_score=bboxes[i, 4])
+        for taskname, model in face_app.models.items():
+            if taskname in ('detection', 'recognition'):
+                continue
+            if pipeline is not None and not pipeline.runs(taskname):
+                continue
+            model.get(img, face)
+        if rec_model is not None and kps is not None:
+            face.crop = face_align.norm_crop(img, landmark=kps, image_size=rec_model.input_size[0])
+        faces.append(face)
+    return faces
+
+
+def embed_crops(face_app, crops):
+    """Run the recognition model once over a batch of aligned crops."""
+    return face_app.models['recognition'].get_feat(list(crops))
@@ -0,0 +1,145 @@
+import os
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU between (n, 4) and (m, 4) x1,y1,x2,y2 boxes."""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float32)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+class Track:
+    __slots__ = ("bbox", "name", "identified_at", "frames_since_identified", "missed")
+
+    def __init__(self, bbox):
+        self.bbox = bbox
+        self.name: Optional[str] = None
+        self.identified_at = 0.0
+        self.frames_since_identified = 0
+        self.missed = 0
+
+
+class FaceTracker:
+    """
+    Per-connection face tracks for the live socket.
+
+    Detections are associated with the previous frame's tracks by bbox IoU.
+    A track keeps the identity it was matched to for up to `max_frames`
+    frames or `max_seconds`; within that window its face is not embedded
+    or matched again. New tracks, unidentified tracks and expired tracks
+    go through the full embedding + gallery match.
+    """
+
+    def __init__(self, iou_threshold: float = 0.4, max_frames: int = 10,
+                 max_seconds: float = 3.0, max_missed: int = 3):
+        self.iou_threshold = iou_threshold
+        self.max_frames = max_frames
+        self.max_seconds = max_seconds
+        self.max_missed = max_missed
+        self.tracks: List[Track] = []
+        self.hits = 0
+        self.misses = 0
+        self.saved_s = 0.0
+        self._embed_s_per_face = 0.0
+
+    @classmethod
+    def from_env(cls) -> "FaceTracker":
+        return cls(
+            iou_threshold=float(os.environ.get("TRACK_IOU_THRESHOLD", 0.4)),
+            max_frames=int(os.environ.get("TRACK_MAX_FRAMES", 10)),
+            max_seconds=float(os.environ.get("TRACK_MAX_SECONDS", 3.0)),
+        )
+
+    def _is_fresh(self, track: Track, now: float) -> bool:
+        return (
+            track.name is not None
+            and track.frames_since_identified < self.max_frames
+            and now - track.identified_at < self.max_seconds
+        )
+
+    def assign(self, bboxes) -> List[Tuple[Track, bool]]:
+        """
+        Associate this frame's detections with tracks.
+        Returns one (track, needs_embedding) per detection, in order.
+        """
+        now = time.monotonic()
+        boxes = np.asarray(bboxes, dtype=np.float32).reshape(-1, 4)
+        previous = np.array([t.bbox for t in self.tracks], dtype=np.float32).reshape(-1, 4)
+        iou = iou_matrix(boxes, previous)
+
+        # Greedy association, best overlap first
+        matched = {}
+        used = set()
+        if iou.size:
+            for flat in np.argsort(-iou, axis=None):
+                det, trk = divmod(int(flat), iou.shape[1])
+                if iou[det, trk] < self.iou_threshold:
+                    break
+                if det in matched or trk in used:
+                    continue
+                matched[det] = trk
+                used.add(trk)
+
+        result = []
+        next_tracks = []
+        for det, box in enumerate(boxes):
+            if det in matched:
+                track = self.tracks[matched[det]]
+                track.bbox = box
+                track.missed = 0
+                track.frames_since_identified += 1
+            else:
+                track = Track(box)
+            fresh = self._is_fresh(track, now)
+            if fresh:
+                self.hits += 1
+                self.saved_s += self._embed_s_per_face
+            else:
+                self.misses += 1
+            result.append((track, not fresh))
+            next_tracks.append(track)
+
+        # Keep unmatched tracks for a few frames (blinks, missed detections)
+        for idx, track in enumerate(self.tracks):
+            if idx not in used:
+                track.missed += 1
+                if track.missed <= self.max_missed:
+                    next_tracks.append(track)
+        self.tracks = next_tracks
+        return result
+
+    def identify(self, track: Track, name: Optional[str]):
+        track.name = name
+        track.identified_at = time.monotonic()
+        track.frames_since_identified = 0
+
+    def record_embedding_time(self, seconds: float, faces: int):
+        """Running average of embed + match cost per face, used for time saved."""
+        if faces <= 0:
+            return
+        per_face = seconds / faces
+        if self._embed_s_per_face == 0.0:
+            self._embed_s_per_face = per_face
+        else:
+            self._embed_s_per_face = 0.8 * self._embed_s_per_face + 0.2 * per_face
+
+    def stats(self, frame_hits: int, frame_faces: int) -> dict:
+        total = self.hits + self.misses
+        return {
+            "frame_hits": frame_hits,
+            "frame_faces": frame_faces,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "saved_ms": round(self.saved_s * 1000.0, 1),
+        }
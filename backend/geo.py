@@ -0,0 +1,153 @@
+import math
+from typing import Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+# WGS-84 mean Earth radius in meters
+EARTH_RADIUS_M = 6371008.8
+
+UNIT_CONVERSIONS = {
+    'meters': 1.0,
+    'm': 1.0,
+    'kilometers': 0.001,
+    'km': 0.001,
+    'miles': 0.000621371,
+    'mi': 0.000621371,
+    'feet': 3.28084,
+    'ft': 3.28084,
+    'nautical_miles': 0.000539957,
+    'nm': 0.000539957,
+}
+
+# Rounding per unit: 0.1 m, 1 m, ~1.6 m, otherwise 2 decimals
+_PRECISION = {'meters': 1, 'm': 1, 'kilometers': 3, 'km': 3, 'miles': 3, 'mi': 3}
+
+
+def _convert(distance_meters: float, unit: str) -> float:
+    unit = unit.lower()
+    if unit not in UNIT_CONVERSIONS:
+        raise ValueError(f"Invalid unit '{unit}'. Use: meters, km, miles, feet, nautical_miles")
+    return round(distance_meters * UNIT_CONVERSIONS[unit], _PRECISION.get(unit, 2))
+
+
+def _as_points(points) -> np.ndarray:
+    """(n, 2) float64 array of (latitude, longitude), validated."""
+    try:
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    except (TypeError, ValueError):
+        raise ValueError("All coordinates must be numeric values")
+    if not np.all(np.abs(pts[:, 0]) <= 90):
+        raise ValueError("Latitude must be between -90 and 90 degrees")
+    if not np.all(np.abs(pts[:, 1]) <= 180):
+        raise ValueError("Longitude must be between -180 and 180 degrees")
+    return pts
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float, unit: str = 'meters') -> float:
+    """Great-circle distance between two points, in plain float math."""
+    try:
+        lat1, lon1, lat2, lon2 = map(float, [lat1, lon1, lat2, lon2])
+    except (TypeError, ValueError):
+        raise ValueError("All coordinates must be numeric values")
+    if not (-90 <= lat1 <= 90 and -90 <= lat2 <= 90):
+        raise ValueError("Latitude must be between -90 and 90 degrees")
+    if not (-180 <= lon1 <= 180 and -180 <= lon2 <= 180):
+        raise ValueError("Longitude must be between -180 and 180 degrees")
+    if lat1 == lat2 and lon1 == lon2:
+        return 0.0
+
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2.0) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2.0) ** 2
+    a = min(max(a, 0.0), 1.0)
+    c = 2.0 * math.atan2(math.sqrt(a), math.sqrt(1.0 - a))
+    return _convert(EARTH_RADIUS_M * c, unit)
+
+
+def distance_matrix(points, sites) -> np.ndarray:
+    """
+    Haversine distances in meters between every point and every site,
+    shape (points, sites). Both take (latitude, longitude) pairs.
+    """
+    pts = np.radians(_as_points(points))
+    sts = np.radians(_as_points(sites))
+    lat1 = pts[:, 0:1]
+    lat2 = sts[:, 0][None, :]
+    dlat = lat2 - lat1
+    dlon = sts[:, 1][None, :] - pts[:, 1:2]
+    a = np.sin(dlat / 2.0) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2.0) ** 2
+    np.clip(a, 0.0, 1.0, out=a)
+    return EARTH_RADIUS_M * 2.0 * np.arctan2(np.sqrt(a), np.sqrt(1.0 - a))
+
+
+def points_in_polygon(points, polygon) -> np.ndarray:
+    """
+    Even-odd ray casting for each (latitude, longitude) point against one
+    polygon given as its vertices in order. Plane geometry on degrees, which
+    is accurate for site-sized polygons away from the poles and antimeridian.
+    """
+    pts = _as_points(points)
+    poly = _as_points(polygon)
+    if len(poly) < 3:
+        raise ValueError("A polygon needs at least 3 vertices")
+    y, x = pts[:, 0:1], pts[:, 1:2]
+    y1, x1 = poly[:, 0][None, :], poly[:, 1][None, :]
+    y2, x2 = np.roll(poly[:, 0], -1)[None, :], np.roll(poly[:, 1], -1)[None, :]
+    straddles = (y1 > y) != (y2 > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_cross = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+    crossings = straddles & (x < x_cross)
+    return (np.count_nonzero(crossings, axis=1) % 2) == 1
+
+
+class Geofence:
+    """
+    Accepted zone made of circular sites and/or polygons.
+
+    Sites are (latitude, longitude) centres with one radius each (or one
+    shared radius) in meters. A point is inside when it is within the radius
+    of any site or inside any polygon. Every query takes one or many points
+    and costs one vectorized pass.
+    """
+
+    def __init__(self, sites: Iterable[Sequence[float]] = (), radius=None, polygons: Iterable = ()):
+        self.sites = _as_points(list(sites))
+        if len(self.sites) and radius is None:
+            raise ValueError("Circular sites need a radius")
+        self.radius = np.broadcast_to(np.asarray(radius if radius is not None else 0.0, dtype=np.float64), (len(self.sites),))
+        self.polygons = [_as_points(poly) for poly in polygons]
+
+    def __len__(self) -> int:
+        return len(self.sites) + len(self.polygons)
+
+    def distances(self, points) -> np.ndarray:
+        """Meters from each point to each site centre, shape (points, sites)."""
+        return distance_matrix(points, self.sites)
+
+    def nearest(self, points) -> Tuple[np.ndarray, np.ndarray]:
+        """Index of the closest site and its distance in meters, per point."""
+        if not len(self.sites):
+            raise ValueError("Geofence has no circular sites")
+        dist = self.distances(points)
+        idx = dist.argmin(axis=1)
+        return idx, dist[np.arange(len(idx)), idx]
+
+    def contains(self, points) -> np.ndarray:
+        pts = _as_points(points)
+        inside = np.zeros(len(pts), dtype=bool)
+        if len(self.sites):
+            inside |= (self.distances(pts) <= self.radius[None, :]).any(axis=1)
+        for poly in self.polygons:
+            inside |= points_in_polygon(pts, poly)
+        return inside
+
+    def distance(self, latitude: float, longitude: float, unit: str = 'meters') -> Optional[float]:
+        """Distance from one point to the closest site, rounded like haversine()."""
+        if not len(self.sites):
+            return None
+        if len(self.sites) == 1:
+            lat, lon = self.sites[0].tolist()
+            return haversine(lat, lon, latitude, longitude, unit)
+        _, dist = self.nearest([(latitude, longitude)])
+        return _convert(float(dist[0]), unit)
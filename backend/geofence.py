@@ -0,0 +1,86 @@
+import math
+import time
+from typing import List, Optional, Tuple
+
+from geo import Geofence
+
+GPS_ID = "00000000-0000-0000-0000-000000000001"
+DIST_ID = "00000000-0000-0000-0000-000000000002"
+
+
+def parse_distance(value) -> float:
+    """Radius in meters from a client or a `distance` row (often a string); ValueError when not a finite number >= 0."""
+    try:
+        dist = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid distance: {value!r}")
+    if not math.isfinite(dist) or dist < 0:
+        raise ValueError(f"invalid distance: {value!r}")
+    return dist
+
+
+class GeofenceConfig:
+    """
+    Admin GPS sites and accepted radius for /v2/recognize, kept in memory.
+
+    load() reads the `gps` rows (one site per row; /v2/gps sets the main one)
+    and the `distance` row; set_location() and set_max_distance() write
+    through to Supabase and update the cached values once the upsert
+    succeeds. The periodic refresh calls load() again to pick up changes
+    made outside this process. The blocking methods are meant to run
+    through asyncio.to_thread.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.sites: List[Tuple[str, float, float]] = []  # (id, latitude, longitude)
+        self.max_distance: Optional[float] = None
+        self.loaded_at: Optional[float] = None
+        self.fence = Geofence()
+
+    @property
+    def active(self) -> bool:
+        """Whether at least one admin location and a radius are set."""
+        return bool(self.sites) and self.max_distance is not None
+
+    def _rebuild(self):
+        if self.active:
+            self.fence = Geofence([(lat, lon) for _, lat, lon in self.sites], radius=self.max_distance)
+        else:
+            self.fence = Geofence()
+
+    def load(self):
+        gps = self.client.table("gps").select("id,latitude,longitude").execute().data or []
+        dist = self.client.table("distance").select("dist").execute().data
+        self.sites = [(row.get("id"), row["latitude"], row["longitude"]) for row in gps]
+        try:
+            self.max_distance = parse_distance(dist[0]["dist"]) if dist else None
+        except ValueError as e:
+            # Keep the radius already in use rather than comparing against a bad value
+            print(f"⚠️ Ignoring stored geofence distance: {e}")
+        self.loaded_at = time.time()
+        self._rebuild()
+
+    def set_location(self, latitude: float, longitude: float):
+        self.client.table("gps").upsert({"id": GPS_ID, "latitude": latitude, "longitude": longitude}).execute()
+        self.sites = [site for site in self.sites if site[0] != GPS_ID] + [(GPS_ID, latitude, longitude)]
+        self._rebuild()
+
+    def set_max_distance(self, dist):
+        dist = parse_distance(dist)
+        self.client.table("distance").upsert({"id": DIST_ID, "dist": dist}).execute()
+        self.max_distance = dist
+        self._rebuild()
+
+    def distance(self, latitude: float, longitude: float) -> Optional[float]:
+        """Meters from the point to the closest site (0.1 m precision), None when inactive."""
+        if not self.active:
+            return None
+        return self.fence.distance(latitude, longitude)
+
+    def to_dict(self) -> dict:
+        return {
+            "sites": [{"latitude": lat, "longitude": lon} for _, lat, lon in self.sites],
+            "max_distance": self.max_distance,
+            "loaded_at": self.loaded_at,
+        }
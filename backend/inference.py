@@ -0,0 +1,71 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+class InferenceSaturated(Exception):
+    """Raised when the inference queue is full; callers should retry later."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Inference queue full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class InferenceExecutor:
+    """
+    Bounded worker pool for blocking model calls (face_app.get and friends).
+
+    ONNX Runtime releases the GIL while a session runs, so a thread pool
+    sharing the already loaded models gives real parallelism without
+    loading one copy of every model per process. At most `workers` calls
+    run at once and at most `max_queue` more wait; beyond that run()
+    raises InferenceSaturated straight away instead of piling up work.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 8, retry_after: int = 1):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.workers = workers
+        self.max_queue = max(0, max_queue)
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inference")
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls) -> "InferenceExecutor":
+        return cls(
+            workers=int(os.environ.get("INFERENCE_WORKERS", 2)),
+            max_queue=int(os.environ.get("INFERENCE_QUEUE_LIMIT", 8)),
+            retry_after=int(os.environ.get("INFERENCE_RETRY_AFTER", 1)),
+        )
+
+    @property
+    def pending(self) -> int:
+        """Calls running or waiting for a worker."""
+        return self._pending
+
+    async def run(self, func, *args):
+        if self._pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise InferenceSaturated(self.retry_after)
+        self._pending += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+            self.completed += 1
+            return result
+        finally:
+            self._pending -= 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
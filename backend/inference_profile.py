@@ -0,0 +1,86 @@
+import os
+
+import onnxruntime as ort
+from insightface.app import FaceAnalysis
+
+
+class InferenceProfile:
+    """
+    Deployment profile for the face models.
+
+    gpu: CUDA execution provider, fp32 buffalo_l pack, MiniFASNet on cuda:0.
+    cpu: CPU execution provider with tuned thread counts, INT8 pack built
+         by quantize_models.py, MiniFASNet on CPU.
+    """
+
+    def __init__(self, name, providers, ctx_id, model_pack, torch_device,
+                 intra_op_threads=0, inter_op_threads=0):
+        self.name = name
+        self.providers = providers
+        self.ctx_id = ctx_id
+        self.model_pack = model_pack
+        self.torch_device = torch_device
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+
+    def session_options(self):
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.intra_op_threads:
+            options.intra_op_num_threads = self.intra_op_threads
+        if self.inter_op_threads:
+            options.inter_op_num_threads = self.inter_op_threads
+            options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        return options
+
+    def build_face_app(self, det_size=(640, 640), allowed_modules=None):
+        face_app = FaceAnalysis(
+            name=self.model_pack,
+            allowed_modules=allowed_modules,
+            providers=self.providers,
+            sess_options=self.session_options(),
+        )
+        face_app.prepare(ctx_id=self.ctx_id, det_size=det_size)
+        return face_app
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "providers": self.providers,
+            "model_pack": self.model_pack,
+            "intra_op_threads": self.intra_op_threads,
+            "inter_op_threads": self.inter_op_threads,
+        }
+
+
+def _cpu_threads():
+    # Each inference worker runs one session call at a time: split the cores between them
+    workers = int(os.environ.get("INFERENCE_WORKERS", 2))
+    default = max(1, (os.cpu_count() or 1) // max(1, workers))
+    return int(os.environ.get("INFERENCE_INTRA_OP_THREADS", default))
+
+
+def get_profile(name=None):
+    name = (name or os.environ.get("INFERENCE_PROFILE", "gpu")).lower()
+    if name == "gpu":
+        return InferenceProfile(
+            name="gpu",
+            providers=["CUDAExecutionProvider", "CPUExecutionProvider"],
+            ctx_id=0,
+            model_pack=os.environ.get("FACE_MODEL_PACK", "buffalo_l"),
+            torch_device=0,
+        )
+    if name == "cpu":
+        return InferenceProfile(
+            name="cpu",
+            providers=["CPUExecutionProvider"],
+            ctx_id=-1,
+            model_pack=os.environ.get("FACE_MODEL_PACK", "buffalo_l_int8"),
+            torch_device=-1,
+            intra_op_threads=_cpu_threads(),
+            inter_op_threads=int(os.environ.get("INFERENCE_INTER_OP_THREADS", 1)),
+        )
+    raise ValueError(f"Unknown inference profile '{name}'. Use: gpu, cpu")
+
+
+PROFILE = get_profile()
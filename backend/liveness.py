@@ -2,18 +2,22 @@
 import os
 import cv2
 import numpy as np
+import torch
 from typing import Tuple, Optional
 
 # Reuse the SFAS code you copied over
 from src.anti_spoof_predict import AntiSpoofPredict
 from src.generate_patches import CropImage
 from src.utility import parse_model_name
+from inference_profile import PROFILE
 
 # Choose ONE robust, still-fast model (good vs phone screen attacks)
 MODEL_PATH = "resources/anti_spoof_models/4_0_0_80x80_MiniFASNetV1SE.pth"
 
-# Init once
-_model = AntiSpoofPredict(device_id=0)     # set to 0 for GPU, or -1 for CPU if you changed the class
+# Init once, on the device of the active inference profile (-1 = CPU)
+if PROFILE.torch_device < 0 and PROFILE.intra_op_threads:
+    torch.set_num_threads(PROFILE.intra_op_threads)
+_model = AntiSpoofPredict(device_id=PROFILE.torch_device)
 _cropper = CropImage()
 
 # Parse its input spec just once
@@ -0,0 +1,79 @@
+import asyncio
+import os
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class MemberCache:
+    """
+    Short-lived in-process cache of `members` rows, by id and by username.
+
+    Lookups that miss (or hit an expired entry) read the row from Supabase
+    and cache it under both keys for `ttl` seconds. Unknown members are not
+    cached, so a new registration is visible at once. Writers call
+    invalidate() for the members they change; the TTL bounds staleness for
+    changes made outside this process.
+    """
+
+    def __init__(self, client, ttl: float = 30.0):
+        self.client = client
+        self.ttl = ttl
+        self._by_id: Dict[str, Tuple[float, dict]] = {}
+        self._by_username: Dict[str, Tuple[float, dict]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls, client) -> "MemberCache":
+        return cls(client, ttl=float(os.environ.get("MEMBER_CACHE_TTL", 30)))
+
+    def _put(self, row: dict, expires: float):
+        if row.get("id") is not None:
+            self._by_id[row["id"]] = (expires, row)
+        if row.get("username"):
+            self._by_username[row["username"]] = (expires, row)
+
+    def prime(self, rows: Iterable[dict]):
+        """Cache rows already fetched elsewhere (the full members list)."""
+        expires = time.monotonic() + self.ttl
+        for row in rows:
+            self._put(row, expires)
+
+    async def _lookup(self, entries, column, value) -> Optional[dict]:
+        if not value:
+            return None
+        entry = entries.get(value)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        rows = await asyncio.to_thread(
+            lambda: self.client.table("members").select("*").eq(column, value).execute().data
+        )
+        if not rows:
+            entries.pop(value, None)
+            return None
+        self._put(rows[0], time.monotonic() + self.ttl)
+        return rows[0]
+
+    async def by_id(self, member_id) -> Optional[dict]:
+        return await self._lookup(self._by_id, "id", member_id)
+
+    async def by_username(self, username) -> Optional[dict]:
+        return await self._lookup(self._by_username, "username", username)
+
+    def invalidate(self, member_id=None, username=None):
+        """Drop a member under both keys, whichever one the caller knows."""
+        for entry in (self._by_id.pop(member_id, None), self._by_username.pop(username, None)):
+            if entry is not None:
+                row = entry[1]
+                self._by_id.pop(row.get("id"), None)
+                self._by_username.pop(row.get("username"), None)
+
+    def clear(self):
+        self._by_id.clear()
+        self._by_username.clear()
+
+    def stats(self) -> dict:
+        return {"ttl": self.ttl, "members": len(self._by_id), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,70 @@
+"""
+Build the packed embedding store from the legacy one-pickle-per-member folder.
+
+Usage (from backend/):
+    python migrate_embeddings.py
+    python migrate_embeddings.py --pickles known_faces_embeddings --images known_faces --store known_faces_store
+
+Pickles older than their image are skipped: they would have been recomputed
+by the old loader, so the next /v2/reload-faces embeds those images instead.
+"""
+import argparse
+import os
+import pickle
+
+import numpy as np
+
+from embedding_store import EmbeddingStore, file_sha1
+
+
+def migrate(pickle_folder: str, image_folder: str, store_folder: str):
+    entries = []
+    skipped = []
+
+    for filename in sorted(os.listdir(pickle_folder)):
+        name, ext = os.path.splitext(filename)
+        if ext.lower() != ".pkl":
+            continue
+
+        pkl_path = os.path.join(pickle_folder, filename)
+        img_path = next(
+            (os.path.join(image_folder, name + e) for e in (".jpg", ".png")
+             if os.path.exists(os.path.join(image_folder, name + e))),
+            None,
+        )
+        if img_path is None:
+            skipped.append((name, "no image"))
+            continue
+        if os.path.getmtime(pkl_path) < os.path.getmtime(img_path):
+            skipped.append((name, "stale pickle"))
+            continue
+
+        try:
+            with open(pkl_path, "rb") as f:
+                emb = np.asarray(pickle.load(f), dtype=np.float32).ravel()
+        except Exception as e:
+            skipped.append((name, f"unreadable pickle: {e}"))
+            continue
+
+        emb = emb / np.linalg.norm(emb)
+        entries.append((name, emb, file_sha1(img_path)))
+
+    EmbeddingStore(store_folder).rewrite(entries)
+    return entries, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pickles", default="known_faces_embeddings")
+    parser.add_argument("--images", default="known_faces")
+    parser.add_argument("--store", default="known_faces_store")
+    args = parser.parse_args()
+
+    entries, skipped = migrate(args.pickles, args.images, args.store)
+    print(f"✅ {len(entries)} embeddings written to {args.store}")
+    for name, reason in skipped:
+        print(f"⚠️ Skipped {name}: {reason}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import numpy as np
+from babel.dates import format_datetime
+
+from attendance_index import AttendanceIndex
+from attendance_store import to_datetime
+
+
+class PresenceMatrix:
+    """
+    Bit-packed member x session presence, replacing per-member lists of
+    session dicts.
+
+    Each member with attendance gets one row of packed bits, one bit per
+    session in the index's session order, so new sessions and members only
+    add bits: extend() folds in the pairs AttendanceIndex.extend() reports
+    at a cost proportional to them. Clients see sessions as columns, most
+    recent first; `columns` maps a column to its session and is re-sorted
+    on every extend (one sort over the sessions, not the matrix). Presence
+    lists are rendered on request, and the Malagasy date string of a
+    session is formatted once and shared by every member.
+    """
+
+    def __init__(self, index: AttendanceIndex):
+        self.index = index
+        self.columns = np.empty(0, dtype=np.int64)  # session index per column, newest first
+        self.member_rows = {}  # member id -> bit row
+        self._row_of_code = np.empty(0, dtype=np.int64)  # member code -> bit row, -1 when none
+        self.bits = np.zeros((0, 0), dtype=np.uint8)  # (row capacity, session capacity / 8), grows by doubling
+        self._formatted = {}  # session -> rendered session dict
+
+    @classmethod
+    def build(cls, index: AttendanceIndex) -> "PresenceMatrix":
+        matrix = cls(index)
+        matrix.extend(index.pair_keys, np.arange(index.total_sessions))
+        return matrix
+
+    @classmethod
+    def empty(cls) -> "PresenceMatrix":
+        return cls.build(AttendanceIndex())
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def _reserve(self, rows: int, sessions: int):
+        row_cap, byte_cap = self.bits.shape
+        needed_bytes = (sessions + 7) // 8
+        if rows <= row_cap and needed_bytes <= byte_cap:
+            return
+        new_rows = row_cap if rows <= row_cap else max(rows, row_cap * 2)
+        new_bytes = byte_cap if needed_bytes <= byte_cap else max(needed_bytes, byte_cap * 2)
+        grown = np.zeros((new_rows, new_bytes), dtype=np.uint8)
+        grown[:row_cap, :byte_cap] = self.bits
+        self.bits = grown
+
+    def extend(self, pair_keys: np.ndarray, updated_sessions: np.ndarray):
+        """Set the bits of new (member, session) pairs and refresh the column order."""
+        index = self.index
+        member_codes, sessions = AttendanceIndex.split_pairs(pair_keys)
+        n_codes = len(index.store.member_ids)
+        if n_codes > len(self._row_of_code):
+            self._row_of_code = np.concatenate(
+                [self._row_of_code, np.full(n_codes - len(self._row_of_code), -1, dtype=np.int64)]
+            )
+        codes = np.unique(member_codes)
+        new_codes = codes[self._row_of_code[codes] < 0]
+        self._row_of_code[new_codes] = len(self.member_rows) + np.arange(len(new_codes))
+        for code in new_codes.tolist():
+            self.member_rows[index.store.member_ids[code]] = int(self._row_of_code[code])
+        self._reserve(len(self.member_rows), index.total_sessions)
+        rows = self._row_of_code[member_codes]
+        np.bitwise_or.at(self.bits, (rows, sessions // 8), (0x80 >> (sessions % 8)).astype(np.uint8))
+
+        # A session's latest record (raw timestamp, order) may have moved
+        for session in updated_sessions.tolist():
+            self._formatted.pop(session, None)
+        latest = index.store.timestamps[index.session_latest_rows]
+        self.columns = np.argsort(latest, kind="stable")[::-1]
+
+    def _session(self, col):
+        session = int(self.columns[col])
+        cached = self._formatted.get(session)
+        if cached is None:
+            index = self.index
+            latest_row = index.session_latest_rows[session]
+            cached = {
+                "emplacement": index.store.emplacement(index.session_emplacements[session]),
+                "timestamp": format_datetime(to_datetime(index.store.timestamps[latest_row]), "EEEE d MMMM y", locale="mg_MG"),
+                "timestamp_raw": index.store.raw_timestamps[latest_row],
+                "date": str(index.session_dates[session]),
+            }
+            self._formatted[session] = cached
+        return cached
+
+    def raw_timestamp(self, col) -> str:
+        return self._session(col)["timestamp_raw"]
+
+    def member_presence(self, member_id) -> np.ndarray:
+        """Presence per column (most recent session first)."""
+        row = self.member_rows.get(member_id)
+        if row is None:
+            return np.zeros(len(self.columns), dtype=bool)
+        by_session = np.unpackbits(self.bits[row], count=self.index.total_sessions).astype(bool)
+        return by_session[self.columns]
+
+    def render(self, member_id) -> list:
+        """Presence list for one member, most recent session first ([] if never present)."""
+        if member_id not in self.member_rows:
+            return []
+        present = self.member_presence(member_id)
+        return [
+            {**self._session(col), "attendance": "present" if is_present else "absent"}
+            for col, is_present in enumerate(present.tolist())
+        ]
+
+    def find_session(self, emplacement, formatted_timestamp):
+        """Column of the session shown to clients as (emplacement, formatted date), or None."""
+        code = self.index.store.emplacement_code(emplacement)
+        if code < 0:
+            return None
+        for col, session in enumerate(self.columns.tolist()):
+            if self.index.session_emplacements[session] == code and self._session(col)["timestamp"] == formatted_timestamp:
+                return col
+        return None
+
+    def mark_present(self, member_id, col) -> bool:
+        row = self.member_rows.get(member_id)
+        if row is None:
+            return False
+        session = int(self.columns[col])
+        self.bits[row, session // 8] |= np.uint8(0x80 >> (session % 8))
+        return True
@@ -0,0 +1,62 @@
+"""
+Build the INT8 model pack used by the cpu inference profile.
+
+Detection and recognition models get dynamic INT8 weight quantization.
+Any other model in the pack is copied unchanged.
+
+Usage (from backend/):
+    python quantize_models.py
+    python quantize_models.py --src buffalo_l --dst buffalo_l_int8 --root ~/.insightface
+"""
+import argparse
+import os
+import shutil
+
+import onnx
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from insightface.model_zoo import model_zoo
+
+
+QUANTIZED_TASKS = ("detection", "recognition")
+
+
+def quantize_pack(root: str, src: str, dst: str):
+    src_dir = os.path.join(os.path.expanduser(root), "models", src)
+    dst_dir = os.path.join(os.path.expanduser(root), "models", dst)
+    if not os.path.isdir(src_dir):
+        raise FileNotFoundError(f"{src_dir} not found: start the server once with the gpu profile or download {src}")
+    os.makedirs(dst_dir, exist_ok=True)
+
+    for filename in sorted(os.listdir(src_dir)):
+        if not filename.endswith(".onnx"):
+            continue
+        src_path = os.path.join(src_dir, filename)
+        dst_path = os.path.join(dst_dir, filename)
+        model = model_zoo.get_model(src_path, providers=["CPUExecutionProvider"])
+        task = getattr(model, "taskname", None)
+
+        if task in QUANTIZED_TASKS:
+            # Shape inference first so ConvInteger/MatMulInteger nodes get typed inputs
+            inferred_path = dst_path + ".infer.onnx"
+            onnx.save(onnx.shape_inference.infer_shapes(onnx.load(src_path)), inferred_path)
+            quantize_dynamic(inferred_path, dst_path, weight_type=QuantType.QUInt8)
+            os.remove(inferred_path)
+            before = os.path.getsize(src_path) / 1e6
+            after = os.path.getsize(dst_path) / 1e6
+            print(f"✅ {filename} ({task}): {before:.1f} MB -> {after:.1f} MB")
+        else:
+            shutil.copyfile(src_path, dst_path)
+            print(f"↪️ {filename} ({task}): copied")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", default="~/.insightface")
+    parser.add_argument("--src", default="buffalo_l")
+    parser.add_argument("--dst", default="buffalo_l_int8")
+    args = parser.parse_args()
+    quantize_pack(args.root, args.src, args.dst)
+
+
+if __name__ == "__main__":
+    main()
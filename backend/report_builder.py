@@ -0,0 +1,186 @@
+import os
+from typing import Callable, List, Optional
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from babel.dates import format_date
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+from attendance_pivot import AttendancePivot
+from attendance_store import AttendanceStore
+
+REPORT_PATH = "tmi_presence_tracker_pivot_with_emplacement_split.xlsx"
+
+# progress(fraction done, stage name)
+Progress = Optional[Callable[[float, str], None]]
+
+# Feo (voice) value -> sheet name; Feo values without attendees get no sheet
+FEO_SHEETS = {
+    1: "Feo 1",
+    2: "Feo 2",
+    3: "Feo 3",
+    4: "Feo 4",
+    5: "P.E",
+}
+
+THIN = Side(border_style="thin", color="000000")
+BORDER = Border(top=THIN, left=THIN, right=THIN, bottom=THIN)
+CENTER = Alignment(horizontal="center", vertical="center")
+
+# Registered once per workbook; every cell refers to one of these by name
+REPORT_STYLES = (
+    NamedStyle(name="report_header", font=Font(bold=True), alignment=CENTER, border=BORDER),
+    NamedStyle(name="report_cell", alignment=CENTER, border=BORDER),
+    NamedStyle(name="report_present", alignment=CENTER, border=BORDER,
+               fill=PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")),
+    NamedStyle(name="report_absent", alignment=CENTER, border=BORDER,
+               fill=PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")),
+    NamedStyle(name="report_rapport", font=Font(bold=True, color="1E90FF"), alignment=CENTER, border=BORDER),
+)
+
+
+def report_debug() -> bool:
+    return os.environ.get("REPORT_DEBUG", "").lower() in ("1", "true", "yes")
+
+
+def roster_frame(members: List[dict]) -> pd.DataFrame:
+    """Feo, Anarana from the `members` rows (username, voice), as tmi_lisitra.xlsx held them."""
+    members = [m for m in members if m.get("username")]
+    return pd.DataFrame({
+        "Feo": pd.to_numeric(pd.Series([m.get("voice") for m in members], dtype=object), errors="coerce"),
+        "Anarana": [m["username"] for m in members],
+    })
+
+
+def attendance_columns(store: AttendanceStore):
+    """
+    Attendance rows in chronological order as (names, places, date codes,
+    date labels). Each distinct day is formatted once ("7 Septambra 2024");
+    rows without a timestamp are left out.
+    """
+    order = np.argsort(store.timestamps, kind="stable")
+    days = store.timestamps[order].astype("datetime64[D]")
+    order, days = order[~np.isnat(days)], days[~np.isnat(days)]
+    unique_days, date_codes = np.unique(days, return_inverse=True)
+    dates = [format_date(day.item(), format="d MMMM y", locale="mg_MG") for day in unique_days]
+
+    names = [store.username(code) for code in store.member_codes[order].tolist()]
+    places = [store.emplacements[code] if code >= 0 else None for code in store.emplacement_codes[order].tolist()]
+    return names, places, date_codes.ravel(), dates
+
+
+def pivot_from_store(store: AttendanceStore, roster: pd.DataFrame) -> AttendancePivot:
+    names, places, date_codes, dates = attendance_columns(store)
+    return AttendancePivot.build(roster["Feo"], roster["Anarana"], names, places, date_codes, dates)
+
+
+def sort_key(name) -> str:
+    return str(name).lower() if name else ""
+
+
+def text_width(values) -> int:
+    return max((len(str(value)) for value in values if value), default=0)
+
+
+def column_widths(pivot: AttendancePivot, rows: np.ndarray, header: list, rapport: List[str]) -> List[int]:
+    """Widest text per column (emplacement, header, data and rapport rows), from the pivot, not the sheet."""
+    grid = 1 if len(rows) else 0  # "P" / "A"
+    widths = [
+        max(len("Feo"), text_width(pivot.feo[rows].tolist())),
+        max(len("Anarana"), text_width(pivot.names[row] for row in rows.tolist())),
+    ]
+    for date, place, percent in zip(pivot.dates, pivot.emplacements, rapport):
+        widths.append(max(grid, text_width((date, place, percent))))
+    widths.append(max(len(header[-1]), text_width(pivot.totals[rows].tolist())))
+    return [width + 2 for width in widths]
+
+
+def write_sheet(ws, pivot: AttendancePivot, feo_value):
+    """
+    One Feo sheet, streamed row by row: emplacement row, headers, P/A rows
+    sorted by Anarana, rapport row. Everything the sheet-level settings
+    need (widths, filter range) is known before the first row is written.
+    """
+    rows = pivot.rows_for(feo_value)
+    rapport = pivot.rapport(rows)
+    rows = rows[np.argsort([sort_key(pivot.names[row]) for row in rows.tolist()], kind="stable")]
+    header = ["Feo", "Anarana"] + pivot.dates + [pivot.total_column]
+
+    for col, width in enumerate(column_widths(pivot, rows, header, rapport), 1):
+        ws.column_dimensions[get_column_letter(col)].width = width
+    ws.column_dimensions["A"].hidden = True
+    ws.freeze_panes = "C3"
+    # Filter on the data rows only; the rapport row stays below it
+    ws.auto_filter.ref = f"A2:{get_column_letter(len(header))}{len(rows) + 2}"
+
+    def styled(values, style):
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = style
+            cells.append(cell)
+        return cells
+
+    ws.append(styled(["", ""] + pivot.emplacements + [""], "report_header"))
+    ws.append(styled(header, "report_header"))
+    feo, present, totals = pivot.feo[rows].tolist(), pivot.present[rows].tolist(), pivot.totals[rows].tolist()
+    for i, row in enumerate(rows.tolist()):
+        cells = styled((feo[i], pivot.names[row]), "report_cell")
+        for mark in present[i]:
+            cell = WriteOnlyCell(ws, value="P" if mark else "A")
+            cell.style = "report_present" if mark else "report_absent"
+            cells.append(cell)
+        cells.extend(styled((totals[i],), "report_cell"))
+        ws.append(cells)
+    ws.append(styled(["", ""] + rapport + [""], "report_rapport"))
+
+
+def write_split_workbook(pivot: AttendancePivot, path: str = REPORT_PATH, progress: Progress = None):
+    """
+    Write-only workbook: rows go straight to the file instead of an
+    in-memory cell grid. progress(fraction, stage) is called after each sheet.
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    for style in REPORT_STYLES:
+        wb.add_named_style(style)
+    sheets = [(feo, name) for feo, name in FEO_SHEETS.items() if len(pivot.rows_for(feo))]
+    for done, (feo_value, sheet_name) in enumerate(sheets, 1):
+        write_sheet(wb.create_sheet(title=sheet_name), pivot, feo_value)
+        if progress:
+            progress(done / (len(sheets) + 1), sheet_name)
+    wb.save(path)
+
+
+def write_debug_artefacts(store: AttendanceStore, roster: pd.DataFrame, pivot: AttendancePivot):
+    """The intermediate files the report used to round-trip through, for inspection."""
+    names, places, date_codes, dates = attendance_columns(store)
+    roster.to_excel("tmi_lisitra.xlsx", index=False)
+    pd.DataFrame({
+        "Anarana": names,
+        "Toerana": ["N/A" if place is None else place for place in places],
+        "Daty": [dates[code] for code in date_codes.tolist()],
+    }).to_excel("tmi_presence.xlsx", index=False, sheet_name="tmi_presence")
+    pivot.to_frame().to_excel("tmi_presence_tracker_pivot.xlsx", index=False)
+
+
+def build_report(store: AttendanceStore, members: List[dict], path: str = REPORT_PATH, debug: bool = None,
+                 progress: Progress = None) -> str:
+    """
+    Attendance report straight from the in-memory store and the members
+    rows: one pivot, one workbook written. With REPORT_DEBUG set, the
+    roster, attendance export and pivot are also written next to it.
+    """
+    roster = roster_frame(members)
+    pivot = pivot_from_store(store, roster)
+    sheet_progress = None
+    if progress:
+        progress(0.1, "pivot")
+        # Sheets fill the rest; saving the workbook is the last step
+        sheet_progress = lambda fraction, stage: progress(0.1 + 0.9 * fraction, stage)
+    write_split_workbook(pivot, path, sheet_progress)
+    if report_debug() if debug is None else debug:
+        write_debug_artefacts(store, roster, pivot)
+    return path
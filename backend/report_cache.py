@@ -0,0 +1,101 @@
+import asyncio
+import hashlib
+import json
+import os
+from typing import Awaitable, Callable, Dict, List
+
+from attendance_store import AttendanceStore
+
+# Bump when the report layout changes so cached workbooks are not served
+REPORT_FORMAT = 1
+
+
+class ReportCache:
+    """
+    On-disk cache of generated attendance reports, one file per content
+    version.
+
+    The version covers everything the report is built from: the attendance
+    store's id watermark and row count (new rows raise the watermark,
+    deleted rows lower the count) and a hash of the roster rows in the
+    order the report uses them, so callers fetch the roster in a stable
+    order (by id). A download whose version is on disk is
+    served as is; otherwise one build runs and every concurrent request for
+    the same version waits on it. Only the newest `keep` reports are kept.
+    """
+
+    def __init__(self, directory: str, keep: int = 3):
+        self.directory = directory
+        self.keep = keep
+        self._building: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.builds = 0
+        self.shared = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> "ReportCache":
+        return cls(
+            os.environ.get("REPORT_CACHE_DIR", "report_cache"),
+            keep=int(os.environ.get("REPORT_CACHE_KEEP", 3)),
+        )
+
+    @staticmethod
+    def version(store: AttendanceStore, members: List[dict]) -> str:
+        roster = [[m.get("username"), m.get("voice")] for m in members]
+        digest = hashlib.blake2b(digest_size=12)
+        digest.update(json.dumps([REPORT_FORMAT, store.last_id, len(store), roster], default=str).encode())
+        return digest.hexdigest()
+
+    def path(self, version: str) -> str:
+        return os.path.join(self.directory, f"report_{version}.xlsx")
+
+    async def get(self, version: str, build: Callable[[str], Awaitable]) -> str:
+        """Path of the report for `version`, calling build(path) to write it when it is not cached."""
+        path = self.path(version)
+        task = self._building.get(version)
+        if task is not None:
+            self.shared += 1
+            return await asyncio.shield(task)
+        if os.path.exists(path):
+            self.hits += 1
+            return path
+
+        task = asyncio.create_task(self._build(version, build))
+        self._building[version] = task
+        # Shielded so a client hanging up does not cancel the build other requests wait on
+        return await asyncio.shield(task)
+
+    async def _build(self, version: str, build: Callable[[str], Awaitable]) -> str:
+        path = self.path(version)
+        tmp = path + ".tmp"
+        try:
+            await build(tmp)
+            os.replace(tmp, path)
+            self.builds += 1
+        finally:
+            self._building.pop(version, None)
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        await asyncio.to_thread(self._prune)
+        return path
+
+    def _prune(self):
+        reports = [
+            os.path.join(self.directory, name) for name in os.listdir(self.directory)
+            if name.startswith("report_") and name.endswith(".xlsx")
+        ]
+        reports.sort(key=os.path.getmtime, reverse=True)
+        for path in reports[self.keep:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "builds": self.builds,
+            "shared": self.shared,
+            "building": len(self._building),
+        }
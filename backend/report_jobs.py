@@ -0,0 +1,191 @@
+import asyncio
+import multiprocessing
+import os
+import queue
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+
+from attendance_store import AttendanceStore
+from report_builder import build_report
+from report_cache import ReportCache
+
+# Set in each worker process by _init_worker
+_progress_queue = None
+
+
+def _init_worker(progress_queue):
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def run_report_job(job_id: str, store: AttendanceStore, members: List[dict], path: str) -> str:
+    """Worker process entry point: build the report, posting progress back to the server."""
+    def progress(fraction, stage):
+        _progress_queue.put((job_id, fraction, stage))
+
+    return build_report(store, members, path, progress=progress)
+
+
+class ReportJob:
+    """One report generation request, as the polling endpoints report it."""
+
+    def __init__(self, version: str):
+        self.id = uuid.uuid4().hex
+        self.version = version
+        self.state = "pending"  # pending, running, done, error
+        self.progress = 0.0
+        self.stage = ""
+        self.path: Optional[str] = None
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def active(self) -> bool:
+        return self.state in ("pending", "running")
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "version": self.version,
+            "state": self.state,
+            "progress": round(self.progress, 3),
+            "stage": self.stage,
+            "error": self.error,
+        }
+
+
+class ReportJobs:
+    """
+    Attendance reports built in a separate process pool.
+
+    pandas and openpyxl hold the GIL for most of a build, so running them
+    in a thread of the server slows every other request. submit() takes a
+    compact snapshot of the attendance store and hands it to a worker
+    process; the caller gets a job back at once and polls it (or awaits
+    wait()). Workers post progress on a multiprocessing queue, read on
+    each poll. Builds go through the ReportCache, so a version already on
+    disk completes immediately and one build serves every job asking for
+    the same version. Finished jobs are forgotten after `ttl` seconds.
+    """
+
+    def __init__(self, cache: ReportCache, workers: int = 1, ttl: float = 3600.0):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.cache = cache
+        self.workers = workers
+        self.ttl = ttl
+        # spawn: the server process has model sessions and threads that fork would copy
+        self._context = multiprocessing.get_context("spawn")
+        self._progress = self._context.Queue()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.jobs: Dict[str, ReportJob] = {}
+        self._by_version: Dict[str, ReportJob] = {}
+        self.completed = 0
+        self.failed = 0
+
+    @classmethod
+    def from_env(cls, cache: ReportCache) -> "ReportJobs":
+        return cls(
+            cache,
+            workers=int(os.environ.get("REPORT_WORKERS", 1)),
+            ttl=float(os.environ.get("REPORT_JOB_TTL", 3600)),
+        )
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # Started on first use so the server does not pay for idle worker processes
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=self._context,
+                initializer=_init_worker,
+                initargs=(self._progress,),
+            )
+        return self._pool
+
+    def _drain_progress(self):
+        while True:
+            try:
+                job_id, fraction, stage = self._progress.get_nowait()
+            except queue.Empty:
+                return
+            job = self.jobs.get(job_id)
+            if job is not None and job.active:
+                job.state = "running"
+                job.progress = max(job.progress, fraction)
+                job.stage = stage
+
+    def _prune(self):
+        cutoff = time.time() - self.ttl
+        for job_id, job in list(self.jobs.items()):
+            if job.finished is not None and job.finished < cutoff:
+                del self.jobs[job_id]
+                if self._by_version.get(job.version) is job:
+                    del self._by_version[job.version]
+
+    def submit(self, version: str, store: AttendanceStore, members: List[dict]) -> ReportJob:
+        """
+        Job building the report for `version` from the store as it is now.
+        Returns the existing job when one for the same version is running or
+        has finished and its file is still cached.
+        """
+        self._prune()
+        job = self._by_version.get(version)
+        if job is not None and (job.active or (job.state == "done" and os.path.exists(job.path))):
+            return job
+
+        job = ReportJob(version)
+        self.jobs[job.id] = job
+        self._by_version[version] = job
+        # Snapshot before the first await, so the rows match the version the caller computed
+        job.task = asyncio.create_task(self._run(job, store.snapshot(), members))
+        return job
+
+    async def _run(self, job: ReportJob, store: AttendanceStore, members: List[dict]):
+        async def build(path):
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._executor(), run_report_job, job.id, store, members, path)
+
+        try:
+            job.path = await self.cache.get(job.version, build)
+            job.state = "done"
+            job.progress = 1.0
+            job.stage = "done"
+            self.completed += 1
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                # A worker died (out of memory, killed): start a fresh pool for the next job
+                self._pool = None
+            job.state = "error"
+            job.error = str(e)
+            self.failed += 1
+            print(f"⚠️ Report job {job.id} failed: {e}")
+        finally:
+            job.finished = time.time()
+            self._drain_progress()
+
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        self._drain_progress()
+        return self.jobs.get(job_id)
+
+    async def wait(self, job: ReportJob) -> ReportJob:
+        await asyncio.shield(job.task)
+        return job
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> dict:
+        self._drain_progress()
+        return {
+            "workers": self.workers,
+            "active": sum(job.active for job in self.jobs.values()),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
@@ -0,0 +1,29 @@
+"""
+Start the API with a chosen inference profile.
+
+Usage (from backend/):
+    python serve.py --profile cpu
+    python serve.py --profile gpu --host 0.0.0.0 --port 8000
+
+Same as `INFERENCE_PROFILE=cpu uvicorn main2:app`; the profile has to be
+set before main2 is imported because the models load at import time.
+"""
+import argparse
+import os
+
+import uvicorn
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=["gpu", "cpu"], default=os.environ.get("INFERENCE_PROFILE", "gpu"))
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    os.environ["INFERENCE_PROFILE"] = args.profile
+    uvicorn.run("main2:app", host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
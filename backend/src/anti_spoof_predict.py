@@ -53,8 +53,10 @@ class Detection:
 class AntiSpoofPredict(Detection):
     def __init__(self, device_id):
         super(AntiSpoofPredict, self).__init__()
+        # device_id < 0 forces the CPU build even when CUDA is available
         self.device = torch.device("cuda:{}".format(device_id)
-                                   if torch.cuda.is_available() else "cpu")
+                                   if device_id >= 0 and torch.cuda.is_available() else "cpu")
+        self.model_path = None
 
     def _load_model(self, model_path):
         # define model
@@ -76,6 +78,8 @@ class AntiSpoofPredict(Detection):
             self.model.load_state_dict(new_state_dict)
         else:
             self.model.load_state_dict(state_dict)
+        self.model.eval()
+        self.model_path = model_path
         return None
 
     def predict(self, img, model_path):
@@ -84,8 +88,9 @@ class AntiSpoofPredict(Detection):
         ])
         img = test_transform(img)
         img = img.unsqueeze(0).to(self.device)
-        self._load_model(model_path)
-        self.model.eval()
+        # Weights are loaded once per model file, not on every prediction
+        if self.model_path != model_path:
+            self._load_model(model_path)
         with torch.no_grad():
             result = self.model.forward(img)
             result = F.softmax(result).cpu().numpy()
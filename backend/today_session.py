@@ -0,0 +1,121 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Callable, Optional
+
+import numpy as np
+
+from attendance_store import AttendanceStore, parse_timestamps
+
+# Madagascar, UTC+3, no DST
+LOCAL_TZ = timezone(timedelta(hours=3))
+
+
+class TodaySession:
+    """
+    Attendance state for the current local day: who is already marked (hash
+    sets of member ids and usernames) and the day's emplacement.
+
+    Every access first checks the local date and starts a fresh day at
+    midnight. refresh() folds in today's rows from the AttendanceStore, so
+    marks made by other processes or inserted directly arrive with the next
+    sync; mark() records a new presence in memory before it is written.
+    """
+
+    def __init__(self, tz: timezone = LOCAL_TZ, now: Callable[[], datetime] = None):
+        self.tz = tz
+        self._now = now or (lambda: datetime.now(self.tz))
+        self.day: Optional[date] = None
+        self.emplacement = ""
+        self.member_ids = set()
+        self.names = set()
+        self.marked = 0
+        self.repeats = 0
+        self.rollovers = 0
+        self._check_day()
+
+    def _check_day(self):
+        today = self._now().date()
+        if today != self.day:
+            if self.day is not None:
+                self.rollovers += 1
+            self.day = today
+            self.emplacement = ""
+            self.member_ids = set()
+            self.names = set()
+            self.marked = 0
+            self.repeats = 0
+
+    def _bounds_utc(self):
+        start = datetime.combine(self.day, time.min, tzinfo=self.tz).astimezone(timezone.utc).replace(tzinfo=None)
+        return np.datetime64(start, "us"), np.datetime64(start + timedelta(days=1), "us")
+
+    def refresh(self, store: AttendanceStore):
+        """Add today's rows from the store (one vectorized scan of the timestamp column)."""
+        self._check_day()
+        start, end = self._bounds_utc()
+        ts = store.timestamps
+        rows = np.flatnonzero((ts >= start) & (ts < end))
+        if not len(rows):
+            return
+        for code in np.unique(store.member_codes[rows]).tolist():
+            if code >= 0:
+                self.member_ids.add(store.member_ids[code])
+                if store.usernames[code]:
+                    self.names.add(store.usernames[code])
+        if not self.emplacement:
+            places = store.emplacement_codes[rows]
+            placed = rows[places >= 0]
+            if len(placed):
+                first = placed[np.argmin(ts[placed])]
+                self.emplacement = store.emplacement(store.emplacement_codes[first])
+
+    def mark_pending(self, rows, username_of: Callable[[str], Optional[str]]):
+        """
+        Add today's rows (member_id, emplacement, ISO timestamp) that are
+        written but not in the store yet, e.g. replayed from the attendance
+        journal. Not counted as new marks.
+        """
+        self._check_day()
+        start, end = self._bounds_utc()
+        ts = parse_timestamps([row.get("timestamp") for row in rows])
+        for row, today in zip(rows, ((ts >= start) & (ts < end)).tolist()):
+            member_id = row.get("member_id")
+            if not today or not member_id:
+                continue
+            self.member_ids.add(member_id)
+            name = username_of(member_id)
+            if name:
+                self.names.add(name)
+            if not self.emplacement and row.get("emplacement"):
+                self.emplacement = row["emplacement"]
+
+    def is_marked(self, name: str) -> bool:
+        self._check_day()
+        return name in self.names
+
+    def mark(self, member_id, name: str, emplacement: str) -> bool:
+        """Record a presence; False (and counted as a repeat) when already marked today."""
+        self._check_day()
+        if member_id in self.member_ids or name in self.names:
+            self.repeats += 1
+            return False
+        self.member_ids.add(member_id)
+        self.names.add(name)
+        if not self.emplacement:
+            self.emplacement = emplacement
+        self.marked += 1
+        return True
+
+    def current_emplacement(self) -> str:
+        self._check_day()
+        return self.emplacement
+
+    def stats(self) -> dict:
+        self._check_day()
+        return {
+            "day": self.day.isoformat(),
+            "emplacement": self.emplacement,
+            "members": len(self.member_ids),
+            "marked": self.marked,
+            "repeats": self.repeats,
+            "rollovers": self.rollovers,
+        }
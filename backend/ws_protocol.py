@@ -0,0 +1,112 @@
+"""
+Frame formats accepted on /ws/v2/recognize.
+
+json (default): text message {"image": <base64 JPEG>, "emplacement": str, "timestamp": ms}
+
+binary (?protocol=binary): one binary message per frame
+    offset  size  field
+    0       4     magic b"TMF1"
+    4       8     client timestamp, float64 little-endian, ms since epoch
+    12      2     emplacement length N, uint16 little-endian
+    14      N     emplacement, UTF-8
+    14+N    ...   raw JPEG bytes
+"""
+import asyncio
+import base64
+import json
+import struct
+import time
+
+import numpy as np
+
+PROTOCOLS = ("json", "binary")
+MAGIC = b"TMF1"
+HEADER = struct.Struct("<4sdH")
+
+
+class FrameError(ValueError):
+    pass
+
+
+class Frame:
+    __slots__ = ("emplacement", "timestamp", "jpeg", "received_at")
+
+    def __init__(self, emplacement, timestamp, jpeg):
+        self.emplacement = emplacement
+        self.timestamp = timestamp
+        self.jpeg = jpeg  # uint8 array over the JPEG bytes, ready for cv2.imdecode
+        self.received_at = time.perf_counter()
+
+    def server_ms(self) -> float:
+        """Time since the frame was received, in ms."""
+        return round((time.perf_counter() - self.received_at) * 1000.0, 1)
+
+
+def encode_binary_frame(jpeg: bytes, emplacement: str, timestamp: float) -> bytes:
+    place = emplacement.encode("utf-8")
+    return HEADER.pack(MAGIC, float(timestamp), len(place)) + place + jpeg
+
+
+def decode_binary_frame(data: bytes) -> Frame:
+    if len(data) < HEADER.size:
+        raise FrameError("Frame too short")
+    magic, timestamp, place_len = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise FrameError("Unknown frame format")
+    start = HEADER.size + place_len
+    if len(data) <= start:
+        raise FrameError("Frame without image")
+    emplacement = bytes(memoryview(data)[HEADER.size:start]).decode("utf-8")
+    # View over the received buffer: no copy of the JPEG bytes
+    jpeg = np.frombuffer(data, dtype=np.uint8, offset=start)
+    return Frame(emplacement, timestamp, jpeg)
+
+
+def decode_json_frame(text: str) -> Frame:
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise FrameError("Frame is not a JSON object")
+    image_b64 = data.get("image")
+    if image_b64 and not isinstance(image_b64, str):
+        raise FrameError("Image is not a base64 string")
+    jpeg = np.frombuffer(base64.b64decode(image_b64), np.uint8) if image_b64 else None
+    return Frame(data.get("emplacement") or "", data.get("timestamp"), jpeg)
+
+
+class LatestFrameSlot:
+    """
+    Single-slot mailbox between a connection's reader and its processor.
+
+    The reader puts every frame it receives; the processor only ever gets
+    the newest one. A frame replaced before it was processed counts as
+    dropped, so end-to-end latency stays bounded when inference is slower
+    than the client's capture rate.
+    """
+
+    def __init__(self):
+        self._item = None
+        self._event = asyncio.Event()
+        self.closed = False
+        self.received = 0
+        self.dropped = 0
+
+    def put(self, item):
+        if self._item is not None:
+            self.dropped += 1
+        self._item = item
+        self.received += 1
+        self._event.set()
+
+    def close(self):
+        self.closed = True
+        self._event.set()
+
+    async def get(self):
+        """Newest unprocessed item, or None once closed and drained."""
+        while self._item is None:
+            if self.closed:
+                return None
+            self._event.clear()
+            await self._event.wait()
+        item, self._item = self._item, None
+        return item